@@ -5,22 +5,67 @@ class Settings(BaseSettings):
     # MongoDB
     MONGODB_URL: str = "mongodb://localhost:27017"
     MONGODB_DB_NAME: str = "sports_analytics"
+    NOTIFICATION_TTL_DAYS: int = 30
+    FANOUT_BATCH_SIZE: int = 5000
+    FANOUT_WORKERS: int = 4
+    FANOUT_QUEUE_SIZE: int = 8  # Batches buffered ahead of the insert workers
     
     # Cassandra
     CASSANDRA_HOSTS: str = "localhost"
     CASSANDRA_KEYSPACE: str = "sports_analytics"
+    CASSANDRA_WRITE_CONCURRENCY: int = 64
     
     # Dgraph
-    DGRAPH_HOSTS: str = "localhost:9080"
+    DGRAPH_HOSTS: str = "localhost:9080"  # Comma-separated list of alphas
+    DGRAPH_STUBS_PER_HOST: int = 2
+    DGRAPH_POOL_SIZE: int = 16
+    PLAYER_INDEX_REFRESH_SECONDS: int = 600
+    PLAYER_STATS_TTL_SECONDS: int = 300
+    LEADERBOARD_MIN_GAMES_SHARE: float = 0.5  # Share of the most games played needed to rank
     
     # JWT
     JWT_SECRET_KEY: str = "your-secret-key"
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # HTTP caching (seconds clients may reuse a response before revalidating)
+    HTTP_CACHE_MAX_AGE: int = 5
+
+    # Render trusted rows with orjson and skip response_model validation
+    FAST_JSON_RESPONSES: bool = False
+
     # SerpAPI
     SERPAPI_API_KEY: str
 
+    # SerpAPI HTTP client
+    SERPAPI_BASE_URL: str = "https://serpapi.com/search"
+    SERPAPI_TIMEOUT_SECONDS: float = 10.0
+    SERPAPI_POOL_SIZE: int = 20
+    SERPAPI_KEEPALIVE_SECONDS: float = 30.0
+
+    # Background ingestion (seconds between polls)
+    INGESTION_ENABLED: bool = True
+    SCOREBOARD_LIVE_INTERVAL: int = 30
+    SCOREBOARD_IDLE_INTERVAL: int = 300
+    SCOREBOARD_OVERNIGHT_INTERVAL: int = 1800
+    STANDINGS_INTERVAL: int = 900
+    STANDINGS_OVERNIGHT_INTERVAL: int = 3600
+    OVERNIGHT_START_HOUR: int = 2
+    OVERNIGHT_END_HOUR: int = 10
+    GAME_TIMEZONE: str = "America/New_York"  # Zone of tip-off times in SerpAPI results
+    GAME_DAY_ROLLOVER_HOUR: int = 6  # Late games before this local hour belong to the previous day
+
+    # Live score streaming
+    LIVE_QUEUE_SIZE: int = 32  # Messages buffered per client before it is dropped
+    LIVE_HEARTBEAT_SECONDS: int = 15
+
+    # Pre-game notifications
+    PREGAME_NOTIFICATIONS_ENABLED: bool = True
+    PREGAME_LEAD_MINUTES: int = 30
+    PREGAME_MAX_LATENESS_SECONDS: int = 300  # Triggers later than this are dropped
+    PREGAME_RELOAD_INTERVAL: int = 900
+    PREGAME_LOOKAHEAD_DAYS: int = 1
+
     class Config:
         env_file = ".env"
         case_sensitive = True
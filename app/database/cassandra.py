@@ -1,16 +1,83 @@
 from cassandra.cluster import Cluster
+from cassandra.concurrent import execute_concurrent
 from cassandra.auth import PlainTextAuthProvider
+from cassandra import InvalidRequest
 from ..config import get_settings
 import time
+import asyncio
 
 settings = get_settings()
 
+# Every CQL statement the application runs, prepared once at connect time
+STATEMENTS = {
+    "insert_gamedetails": """
+        INSERT INTO gamedetails (
+            date, game_id, stage, team1_id, team1_name, team1_score,
+            team2_id, team2_name, team2_score, highlight_video_link, start_time
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "insert_teamgames": """
+        INSERT INTO teamgames (
+            team_id, date, game_id, opponent_team_id, opponent_team_name,
+            team_score, opponent_score, highlight_video_link
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "insert_game_by_id": """
+        INSERT INTO games_by_id (
+            game_id, date, stage, team1_id, team1_name, team1_score,
+            team2_id, team2_name, team2_score, highlight_video_link
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "select_games_by_date": "SELECT * FROM gamedetails WHERE date = ?",
+    "select_all_gamedetails": "SELECT * FROM gamedetails",
+    "select_game_by_id": "SELECT * FROM games_by_id WHERE game_id = ?",
+    "select_game_highlight": """
+        SELECT highlight_video_link FROM games_by_id WHERE game_id = ?
+    """,
+    "select_team_games": "SELECT * FROM teamgames WHERE team_id = ?",
+    "select_team_games_in_range": """
+        SELECT * FROM teamgames WHERE team_id = ? AND date >= ? AND date <= ?
+    """,
+    "select_team_recent_games": """
+        SELECT * FROM teamgames WHERE team_id = ? ORDER BY date DESC LIMIT ?
+    """,
+    "insert_head_to_head": """
+        INSERT INTO head_to_head (
+            team_a_id, team_b_id, date, game_id, team_a_score, team_b_score,
+            highlight_video_link, totals_applied
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, false) IF NOT EXISTS
+    """,
+    "mark_head_to_head_totals_applied": """
+        UPDATE head_to_head SET totals_applied = true
+        WHERE team_a_id = ? AND team_b_id = ? AND date = ? AND game_id = ?
+    """,
+    "update_head_to_head_totals": """
+        UPDATE head_to_head_totals SET
+            total_games = total_games + 1,
+            team_a_wins = team_a_wins + ?,
+            team_b_wins = team_b_wins + ?,
+            team_a_points = team_a_points + ?,
+            team_b_points = team_b_points + ?
+        WHERE team_a_id = ? AND team_b_id = ?
+    """,
+    "select_head_to_head_totals": """
+        SELECT * FROM head_to_head_totals WHERE team_a_id = ? AND team_b_id = ?
+    """,
+    "select_head_to_head_recent": """
+        SELECT * FROM head_to_head WHERE team_a_id = ? AND team_b_id = ? LIMIT ?
+    """,
+}
+
 class CassandraDB:
     def __init__(self):
         self.cluster = None
         self.session = None
+        self.statements = {}
+        self.prepare_count = 0
 
-    def connect(self):
+    def connect(self, keyspace: str = None):
+        """Connect, creating the keyspace (default CASSANDRA_KEYSPACE) and tables if needed"""
+        keyspace = keyspace or settings.CASSANDRA_KEYSPACE
         retries = 0
         max_retries = 5
         while retries < max_retries:
@@ -20,16 +87,17 @@ class CassandraDB:
                 session = self.cluster.connect()
                 
                 # Create keyspace if it doesn't exist
-                session.execute("""
-                    CREATE KEYSPACE IF NOT EXISTS sports_analytics 
-                    WITH replication = {'class': 'SimpleStrategy', 'replication_factor': 1}
+                session.execute(f"""
+                    CREATE KEYSPACE IF NOT EXISTS {keyspace} 
+                    WITH replication = {{'class': 'SimpleStrategy', 'replication_factor': 1}}
                 """)
                 
                 # Now connect with the keyspace
-                self.session = self.cluster.connect(settings.CASSANDRA_KEYSPACE)
+                self.session = self.cluster.connect(keyspace)
                 
                 # Create tables
                 self._create_tables()
+                self._prepare_statements()
                 print("Successfully connected to Cassandra")
                 break
             except Exception as e:
@@ -53,9 +121,15 @@ class CassandraDB:
                 team2_name text,
                 team2_score int,
                 highlight_video_link text,
+                start_time timestamp,
                 PRIMARY KEY ((date), game_id)
             )
         """)
+        try:
+            # Tables created before start_time existed
+            self.session.execute("ALTER TABLE gamedetails ADD start_time timestamp")
+        except InvalidRequest:
+            pass
 
         self.session.execute("""
             CREATE TABLE IF NOT EXISTS teamgames (
@@ -71,6 +145,120 @@ class CassandraDB:
             )
         """)
 
+        # Same rows as gamedetails, partitioned for lookups by game_id
+        self.session.execute("""
+            CREATE TABLE IF NOT EXISTS games_by_id (
+                game_id uuid,
+                date date,
+                stage text,
+                team1_id uuid,
+                team1_name text,
+                team1_score int,
+                team2_id uuid,
+                team2_name text,
+                team2_score int,
+                highlight_video_link text,
+                PRIMARY KEY (game_id)
+            )
+        """)
+
+        # Completed games between two teams, keyed by the ordered team pair
+        self.session.execute("""
+            CREATE TABLE IF NOT EXISTS head_to_head (
+                team_a_id uuid,
+                team_b_id uuid,
+                date date,
+                game_id uuid,
+                team_a_score int,
+                team_b_score int,
+                highlight_video_link text,
+                totals_applied boolean,
+                PRIMARY KEY ((team_a_id, team_b_id), date, game_id)
+            ) WITH CLUSTERING ORDER BY (date DESC, game_id ASC)
+        """)
+        try:
+            # Tables created before totals_applied existed; their rows stay null
+            # and are treated as already counted
+            self.session.execute("ALTER TABLE head_to_head ADD totals_applied boolean")
+        except InvalidRequest:
+            pass
+
+        # Running aggregates for head_to_head, maintained by the game write path
+        self.session.execute("""
+            CREATE TABLE IF NOT EXISTS head_to_head_totals (
+                team_a_id uuid,
+                team_b_id uuid,
+                total_games counter,
+                team_a_wins counter,
+                team_b_wins counter,
+                team_a_points counter,
+                team_b_points counter,
+                PRIMARY KEY ((team_a_id, team_b_id))
+            )
+        """)
+
+    def _prepare_statements(self):
+        for name, cql in STATEMENTS.items():
+            self.statements[name] = self.prepare(cql)
+
+    def prepare(self, cql: str):
+        """Prepare a statement, counting every round trip to the server"""
+        self.prepare_count += 1
+        return self.session.prepare(cql)
+
+    def execute(self, name: str, params=None):
+        """Execute a registered prepared statement by name"""
+        return self.session.execute(self.statements[name], params)
+
+    async def execute_async(self, name: str, params=None, all_pages: bool = True) -> list:
+        """
+        Execute a registered prepared statement without blocking the event loop.
+        Returns the rows of every page, or only the first page if all_pages is False.
+        """
+        response_future = self.session.execute_async(self.statements[name], params)
+        return await self._to_asyncio(response_future, all_pages)
+
+    @staticmethod
+    def _to_asyncio(response_future, all_pages: bool) -> asyncio.Future:
+        # Driver callbacks run on its I/O thread, so results are handed
+        # back to the event loop with call_soon_threadsafe
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        rows = []
+
+        def resolve(setter, value):
+            if not future.done():
+                setter(value)
+
+        def on_page(page):
+            if page:
+                rows.extend(page)
+            if all_pages and response_future.has_more_pages:
+                # Fires on_page again once the next page arrives
+                response_future.start_fetching_next_page()
+            else:
+                loop.call_soon_threadsafe(resolve, future.set_result, rows)
+
+        def on_error(exc):
+            loop.call_soon_threadsafe(resolve, future.set_exception, exc)
+
+        response_future.add_callbacks(on_page, on_error)
+        return future
+
+    def execute_many(self, named_params, concurrency=None):
+        """
+        Execute (statement name, params) pairs with a bounded number of
+        requests in flight. Never raises for individual statements; returns
+        one (success, result_or_exception) pair per input, in order.
+        """
+        statements = [(self.statements[name], params) for name, params in named_params]
+        return execute_concurrent(
+            self.session,
+            statements,
+            concurrency=concurrency or settings.CASSANDRA_WRITE_CONCURRENCY,
+            raise_on_first_error=False
+        )
+
     def close(self):
         if self.cluster:
             self.cluster.shutdown()
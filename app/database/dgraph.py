@@ -1,3 +1,6 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
 import pydgraph
 from ..config import get_settings
 
@@ -6,13 +9,56 @@ settings = get_settings()
 class DgraphDB:
     def __init__(self):
         self.client = None
-        self.stub = None
+        self.stubs = []
+        self.executor = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
 
     def connect(self):
-        self.stub = pydgraph.DgraphClientStub(settings.DGRAPH_HOSTS)
-        self.client = pydgraph.DgraphClient(self.stub)
+        hosts = [host.strip() for host in settings.DGRAPH_HOSTS.split(",") if host.strip()]
+        self.stubs = [
+            pydgraph.DgraphClientStub(host)
+            for host in hosts
+            for _ in range(settings.DGRAPH_STUBS_PER_HOST)
+        ]
+        # DgraphClient picks a random stub for every request
+        self.client = pydgraph.DgraphClient(*self.stubs)
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.DGRAPH_POOL_SIZE,
+            thread_name_prefix="dgraph"
+        )
         self._set_schema()
 
+    async def run(self, fn, *args, **kwargs):
+        """
+        Run a blocking pydgraph call on the bounded Dgraph executor so it
+        never stalls the event loop. Calls beyond the pool size queue up.
+        """
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            return await loop.run_in_executor(
+                self.executor, functools.partial(fn, *args, **kwargs)
+            )
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def stats(self) -> dict:
+        pool_size = settings.DGRAPH_POOL_SIZE
+        return {
+            "stubs": len(self.stubs),
+            "pool_size": pool_size,
+            "in_flight": self.in_flight,
+            "active": min(self.in_flight, pool_size),
+            "queued": max(0, self.in_flight - pool_size),
+            "utilisation": min(self.in_flight, pool_size) / pool_size,
+            "peak_in_flight": self.peak_in_flight,
+            "completed": self.completed
+        }
+
     def _set_schema(self):
         schema = """
             # Define types
@@ -45,7 +91,7 @@ class DgraphDB:
 
             # Define predicates
             player_id: string @index(exact) .
-            name: string @index(exact) .
+            name: string @index(exact, term, trigram, fulltext) .
             position: string @index(exact) .
             season_stats: string .
             plays_for: [uid] @reverse .
@@ -73,7 +119,10 @@ class DgraphDB:
             raise
 
     def close(self):
-        if self.stub:
-            self.stub.close()
+        for stub in self.stubs:
+            stub.close()
+        self.stubs = []
+        if self.executor:
+            self.executor.shutdown(wait=False)
 
 dgraph_db = DgraphDB() 
\ No newline at end of file
@@ -16,9 +16,17 @@ class MongoDB:
         # Create indexes for better query performance
         await self.db.users.create_index("email", unique=True)
         await self.db.users.create_index("username")
+        # Multikey: finds the followers of a team without scanning users
+        await self.db.users.create_index("favorite_teams")
         await self.db.teams.create_index("team_name")
         await self.db.teams.create_index([("conference", 1), ("position", 1)])
-        await self.db.teams.create_index("favorite_teams")
+        # Per-user feed, unread filter and newest-first keyset in one range scan
+        await self.db.notifications.create_index(
+            [("user_id", 1), ("read", 1), ("date", -1), ("_id", -1)]
+        )
+        await self.db.notifications.create_index("expires_at", expireAfterSeconds=0)
+        # One claim per announced game; only needed until the game is over
+        await self.db.pregame_notifications.create_index("date", expireAfterSeconds=7 * 24 * 3600)
 
     async def close(self):
         if self.client:
@@ -4,10 +4,21 @@ from .database.mongodb import mongodb
 from .database.cassandra import cassandra_db
 from .database.dgraph import dgraph_db
 from .routers import auth, users, teams, games, players, analytics
+from .services.serpapi_client import serpapi_client
+from .services.ingestion_scheduler import ingestion_scheduler
+from .services.identity_registry import identity_registry
+from .services.standings_service import standings_service
+from .services.player_search import player_name_index
+from .services.leaderboard_service import leaderboards
+from .services.fanout_service import notification_fanout
+from .services.pregame_scheduler import pregame_scheduler
+from .services.live_scores import live_score_hub
+from .config import get_settings
 import logging
 from fastapi.responses import JSONResponse
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 app = FastAPI(title="Sports Analytics API")
 
@@ -18,6 +29,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["ETag", "Last-Modified", "X-Next-Cursor"],
 )
 
 # Error handler for 500 Internal Server Error
@@ -42,6 +54,12 @@ async def startup():
     try:
         logger.info("Connecting to MongoDB...")
         await mongodb.connect()
+        await identity_registry.load()
+        try:
+            await standings_service.refresh_snapshot()
+        except Exception as e:
+            # Not fatal: /teams reads MongoDB until a snapshot is built
+            logger.error(f"Error building standings snapshot: {str(e)}")
         
         logger.info("Connecting to Cassandra...")
         cassandra_db.connect()
@@ -50,16 +68,59 @@ async def startup():
         dgraph_db.connect()
         
         logger.info("All database connections established successfully")
+
+        logger.info("Building player name index...")
+        try:
+            await player_name_index.refresh()
+        except Exception as e:
+            # Not fatal: the periodic refresh will retry
+            logger.error(f"Error building player name index: {str(e)}")
+        player_name_index.start()
+
+        logger.info("Building player leaderboards...")
+        try:
+            await leaderboards.rebuild()
+        except Exception as e:
+            # Not fatal: boards fill as new box scores are recorded
+            logger.error(f"Error building player leaderboards: {str(e)}")
+
+        if settings.INGESTION_ENABLED:
+            logger.info("Starting background ingestion...")
+            ingestion_scheduler.start()
+
+        if settings.PREGAME_NOTIFICATIONS_ENABLED:
+            logger.info("Scheduling pre-game notifications...")
+            try:
+                await pregame_scheduler.load_upcoming()
+            except Exception as e:
+                # Not fatal: the periodic reload will retry
+                logger.error(f"Error loading pre-game schedule: {str(e)}")
+            pregame_scheduler.start()
     except Exception as e:
         logger.error(f"Error during startup: {str(e)}")
         raise
 
 @app.on_event("shutdown")
 async def shutdown():
+    await player_name_index.stop()
+    await ingestion_scheduler.stop()
+    await pregame_scheduler.stop()
+    await serpapi_client.close()
     await mongodb.close()
     cassandra_db.close()
     dgraph_db.close()
 
 @app.get("/")
 async def root():
-    return {"message": "Welcome to Sports Analytics API"} 
\ No newline at end of file
+    return {"message": "Welcome to Sports Analytics API"}
+
+@app.get("/stats")
+async def stats():
+    """Upstream client, connection pool and background service counters"""
+    return {
+        "serpapi_client": serpapi_client.stats(),
+        "dgraph_pool": dgraph_db.stats(),
+        "notification_fanout": notification_fanout.stats(),
+        "pregame_scheduler": pregame_scheduler.stats(),
+        "live_scores": live_score_hub.stats()
+    } 
\ No newline at end of file
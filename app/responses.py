@@ -0,0 +1,27 @@
+from typing import Any, Optional
+import orjson
+from fastapi import Response
+from .config import get_settings
+
+settings = get_settings()
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson (handles UUID, date and datetime natively)"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+def trusted_response(payload: Any, response: Response, headers: Optional[dict] = None):
+    """
+    Return a payload built by the encoders in schemas/encoders.py.
+
+    With FAST_JSON_RESPONSES enabled the payload is rendered with orjson
+    directly, skipping response_model validation. Otherwise the headers are
+    attached to the injected response and FastAPI validates as usual.
+    """
+    if settings.FAST_JSON_RESPONSES:
+        return FastJSONResponse(payload, headers=headers)
+    if headers:
+        response.headers.update(headers)
+    return payload
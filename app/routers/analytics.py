@@ -1,6 +1,9 @@
-from fastapi import APIRouter, HTTPException
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+from datetime import date
 from ..services.analytics_service import analytics_service
+from ..services.dgraph_service import STAT_FIELDS
+from ..services.player_stats_service import player_stats_service
 
 router = APIRouter()
 
@@ -8,18 +11,44 @@ router = APIRouter()
 async def get_head_to_head_stats(team1_id: str, team2_id: str):
     """Get head-to-head statistics between two teams"""
     stats = await analytics_service.get_head_to_head_stats(team1_id, team2_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Team not found")
     return stats
 
 @router.get("/teams/performance/{team_id}")
 async def get_team_performance(team_id: str, last_n_games: Optional[int] = 10):
     """Get team performance trends"""
     trend = await analytics_service.get_team_performance_trend(team_id, last_n_games)
+    if trend is None:
+        raise HTTPException(status_code=404, detail="Team not found")
     return trend
 
 @router.get("/players/performance/{player_id}")
-async def get_player_performance(player_id: str):
+async def get_player_performance(
+    player_id: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    stats: Optional[List[str]] = Query(default=None, description="Stat categories; defaults to all"),
+    window: int = Query(default=5, ge=1, le=82, description="Rolling average window in games"),
+    span: int = Query(default=10, ge=1, le=82, description="EMA span in games"),
+    points: int = Query(default=50, ge=1, le=500, description="Maximum points per series")
+):
     """Get player performance trends"""
-    trend = await analytics_service.get_player_performance_trend(player_id)
+    stats = stats or list(STAT_FIELDS)
+    unknown = [stat for stat in stats if stat not in STAT_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown stat fields: {', '.join(unknown)}")
+    trend = await analytics_service.get_player_performance_trend(
+        player_id, start_date, end_date, stats, window, span, points
+    )
     if not trend:
         raise HTTPException(status_code=404, detail="Player not found")
-    return trend 
\ No newline at end of file
+    return trend 
+
+@router.get("/players/season/{season}")
+async def get_player_season_aggregates(
+    season: int,
+    min_games: int = Query(default=1, ge=1, description="Minimum games to qualify")
+):
+    """League-wide player totals, per-game and per-36 stats, and percentiles for a season"""
+    return await player_stats_service.aggregate(season, min_games)
@@ -1,64 +1,154 @@
-from fastapi import APIRouter, Query
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from typing import Optional
-from datetime import datetime, date
+from datetime import date
 from ..database.cassandra import cassandra_db
 from ..schemas.game import GameResponse
-from ..services.serpapi_service import serpapi_service
+from ..schemas.encoders import encode_game_row
+from ..responses import trusted_response
+from ..http_cache import make_etag, cache_headers, not_modified_response
+from ..services.live_scores import live_score_hub, date_topic, team_topic
+from ..services.identity_registry import identity_registry
+from ..services.serpapi_service import game_day
+from ..config import get_settings
 import uuid
 
 router = APIRouter()
+settings = get_settings()
+
+async def _fetch_games_for_date(request: Request, response: Response, query_date):
+    """Games for a date, or a 304 if the client's ETag still matches the rows"""
+    rows = await cassandra_db.execute_async("select_games_by_date", [query_date])
+    etag = make_etag(rows)
+    not_modified = not_modified_response(request, etag)
+    if not_modified:
+        return not_modified
+    return trusted_response(
+        [encode_game_row(row) for row in rows], response, cache_headers(etag)
+    )
 
 @router.get("/", response_model=list[GameResponse])
 async def get_games(
+    request: Request,
+    response: Response,
     date: Optional[date] = Query(None, description="Filter games by date (YYYY-MM-DD)")
 ):
     """
-    Get games for a specific date
+    Get games for a specific date.
+    Games are ingested in the background, so this only reads from Cassandra.
     """
-    try:
-        # First try to fetch from SerpAPI
-        games = await serpapi_service.fetch_games(date)
-        if games:
-            return games
+    query_date = date if date else game_day()
+    return await _fetch_games_for_date(request, response, query_date)
 
-        # If no games from SerpAPI, try to fetch from database
-        query_date = date if date else datetime.now().date()
-        query = "SELECT * FROM gamedetails WHERE date = ?"
-        result = cassandra_db.session.execute(query, [query_date])
+@router.get("/recent")
+async def get_recent_games(request: Request, response: Response):
+    """
+    Get today's games as last ingested from SerpAPI
+    """
+    return await _fetch_games_for_date(request, response, game_day())
 
-        games = []
-        for row in result:
-            game = {
-                "game_id": row.game_id,  # UUID objects can be returned directly
-                "date": row.date,
-                "stage": row.stage,
-                "team1_id": row.team1_id,
-                "team1_name": row.team1_name,
-                "team1_score": row.team1_score,
-                "team2_id": row.team2_id,
-                "team2_name": row.team2_name,
-                "team2_score": row.team2_score,
-                "highlight_video_link": row.highlight_video_link or None
-            }
-            games.append(game)
-        
-        return games
-    except Exception as e:
-        print(f"Error fetching games: {str(e)}")
-        return []
+async def _live_topic(game_date: Optional[date], team_id: Optional[str]) -> Optional[str]:
+    """Subscription topic for a team (UUID or MongoDB id) or a date, defaulting to today"""
+    if team_id:
+        team_uuid = await identity_registry.resolve_team(team_id)
+        return team_topic(team_uuid) if team_uuid else None
+    return date_topic(game_date or game_day())
 
-@router.get("/recent")
-async def get_recent_games():
+@router.get("/live")
+async def stream_live_scores(
+    request: Request,
+    date: Optional[date] = Query(None, description="Games on this date (default today)"),
+    team_id: Optional[str] = Query(None, description="Games of this team instead of a date")
+):
+    """
+    Server-Sent Events stream of live scores: a snapshot event, then only the
+    fields that changed after each scoreboard refresh. Clients that fall
+    behind are disconnected and should reconnect for a fresh snapshot.
+    """
+    topic = await _live_topic(date, team_id)
+    if topic is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    subscription = live_score_hub.subscribe(topic)
+
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(subscription.get(), settings.LIVE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                if message is None:
+                    break
+                yield b"data: " + message + b"\n\n"
+        finally:
+            live_score_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/live/ws")
+async def live_scores_websocket(
+    websocket: WebSocket,
+    date: Optional[date] = None,
+    team_id: Optional[str] = None
+):
+    """WebSocket variant of /games/live; every message is one JSON text frame"""
+    topic = await _live_topic(date, team_id)
+    if topic is None:
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+    subscription = live_score_hub.subscribe(topic)
+
+    async def until_disconnect():
+        # Clients only listen; anything they send is ignored
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    disconnected = asyncio.create_task(until_disconnect())
+    try:
+        while True:
+            next_message = asyncio.create_task(subscription.get())
+            await asyncio.wait({next_message, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                next_message.cancel()
+                break
+            message = next_message.result()
+            if message is None:
+                # Slow consumer: the hub stopped queueing for it
+                await websocket.close(code=1013)
+                break
+            await websocket.send_text(message.decode())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        live_score_hub.unsubscribe(subscription)
+
+@router.get("/{game_id}", response_model=GameResponse)
+async def get_game(game_id: str, request: Request, response: Response):
     """
-    Get recent games
+    Get full details for a specific game
     """
     try:
-        # Fetch recent games from SerpAPI
-        games = await serpapi_service.fetch_games()
-        return games
-    except Exception as e:
-        print(f"Error fetching recent games: {str(e)}")
-        return []
+        game_uuid = uuid.UUID(game_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid game ID")
+
+    rows = await cassandra_db.execute_async("select_game_by_id", [game_uuid], all_pages=False)
+    if not rows:
+        raise HTTPException(status_code=404, detail="Game not found")
+
+    etag = make_etag(rows[0])
+    not_modified = not_modified_response(request, etag)
+    if not_modified:
+        return not_modified
+    return trusted_response(encode_game_row(rows[0]), response, cache_headers(etag))
 
 @router.get("/{game_id}/highlights")
 async def get_game_highlights(game_id: str):
@@ -67,12 +157,10 @@ async def get_game_highlights(game_id: str):
     """
     try:
         game_uuid = uuid.UUID(game_id)
-        # Use parameterized query with bind marker
-        query = cassandra_db.session.prepare(
-            "SELECT highlight_video_link FROM gamedetails WHERE game_id = ? ALLOW FILTERING"
+        rows = await cassandra_db.execute_async(
+            "select_game_highlight", [game_uuid], all_pages=False
         )
-        result = cassandra_db.session.execute(query, [game_uuid])
-        row = result.one()
+        row = rows[0] if rows else None
         if row:
             return {"highlight_video_link": row.highlight_video_link}
         return {"highlight_video_link": None}
@@ -1,67 +1,94 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from typing import List, Optional
-from ..schemas.player import PlayerResponse, PlayerCreate, PlayerUpdate
-from ..services.dgraph_service import dgraph_service
+from ..schemas.player import PlayerResponse, PlayerCreate, PlayerUpdate, PlayerGameStats
+from ..schemas.encoders import encode_player_node
+from ..responses import trusted_response
+from ..services.dgraph_service import dgraph_service, STAT_FIELDS
+from ..services.player_queries import players_query, player_games_query, SEARCH_PLAYERS_QUERY
+from ..services.player_search import player_name_index, regex_literal
+from ..services.leaderboard_service import leaderboards
 from ..services.auth import get_current_user
+from ..http_cache import cache_headers, not_modified_response
+from ..pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
 from datetime import datetime
+import re
 
 router = APIRouter()
 
+UID_PATTERN = re.compile(r"0x[0-9a-f]+")
+
 @router.get("/", response_model=List[PlayerResponse])
 async def get_players(
+    response: Response,
     team_id: Optional[str] = None,
     position: Optional[str] = None,
     skip: int = Query(default=0, ge=0),
-    limit: int = Query(default=10, ge=1, le=100)
+    limit: int = Query(default=10, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None, description="Cursor from X-Next-Cursor; replaces skip")
 ):
     """
-    Get players with optional filters
+    Get players with optional filters.
+    Pages are ordered by uid; when more rows may follow, the X-Next-Cursor
+    header carries the cursor for the next page.
     """
-    query = """
-    query players($position: string, $team_id: string, $offset: int, $limit: int) {
-        players(func: type(Player)) @filter(%s) {
-            uid
-            player_id
-            name
-            position
-            season_stats
-            plays_for @facets(since) {
-                uid
-                team_id
-                name
-            }
-        }
-    } offset: $offset, first: $limit
-    """
-    
-    filters = []
-    if position:
-        filters.append(f"eq(position, $position)")
-    if team_id:
-        filters.append(f"has(plays_for) AND uid_in(plays_for, $team_id)")
-    
-    filter_str = " AND ".join(filters) if filters else "has(player_id)"
-    query = query % filter_str
-    
-    variables = {
-        "$position": position,
-        "$team_id": team_id,
-        "$offset": skip,
-        "$limit": limit
-    }
+    after = decode_cursor(cursor, length=1)[0] if cursor else None
+    if cursor and not (isinstance(after, str) and UID_PATTERN.fullmatch(after)):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    query, variables = players_query(position, team_id, skip, limit, after)
     
     result = await dgraph_service.execute_query(query, variables)
-    return [PlayerResponse(**player) for player in result["players"]]
+    players = result["players"]
+
+    headers = {}
+    if len(players) == limit:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor([players[-1]["uid"]])
+    return trusted_response(
+        [encode_player_node(player) for player in players], response, headers
+    )
+
+@router.get("/autocomplete")
+async def autocomplete_players(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(default=10, ge=1, le=10)
+):
+    """
+    Players whose first, middle or last name starts with q, served from memory
+    """
+    return player_name_index.search(q, limit)
+
+@router.get("/leaders")
+async def get_leaders(
+    category: str = Query(default="points"),
+    limit: int = Query(default=25, ge=1, le=100),
+    min_games: Optional[int] = Query(
+        default=None, ge=1,
+        description="Games needed to rank; defaults to LEADERBOARD_MIN_GAMES_SHARE of the most played"
+    )
+):
+    """
+    Current-season per-game leaders for a stat category, served from memory
+    """
+    if category not in STAT_FIELDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown category; expected one of: {', '.join(STAT_FIELDS)}"
+        )
+    return {"season": leaderboards.season, "category": category, "leaders": leaderboards.leaders(category, limit, min_games)}
 
 @router.get("/{player_id}", response_model=PlayerResponse)
-async def get_player(player_id: str):
+async def get_player(player_id: str, request: Request, response: Response):
     """
     Get a specific player by ID
     """
-    player = await dgraph_service.get_player(player_id)
-    if not player:
+    result = await dgraph_service.get_player(player_id, with_etag=True)
+    if not result:
         raise HTTPException(status_code=404, detail="Player not found")
-    return PlayerResponse(**player)
+
+    player, etag = result
+    not_modified = not_modified_response(request, etag)
+    if not_modified:
+        return not_modified
+    return trusted_response(encode_player_node(player), response, cache_headers(etag))
 
 @router.get("/{player_id}/games")
 async def get_player_games(
@@ -72,61 +99,41 @@ async def get_player_games(
     """
     Get games for a specific player with optional date range
     """
-    query = """
-    query player_games($player_id: string, $start_date: datetime, $end_date: datetime) {
-        player(func: eq(player_id, $player_id)) {
-            participated_in @facets(stats) @filter(%s) {
-                uid
-                game_id
-                date
-                stage
-                team1 { uid team_id name }
-                team2 { uid team_id name }
-            }
-        }
-    }
-    """
-    
-    date_filter = []
-    if start_date:
-        date_filter.append(f"ge(date, $start_date)")
-    if end_date:
-        date_filter.append(f"le(date, $end_date)")
-    
-    filter_str = " AND ".join(date_filter) if date_filter else "has(game_id)"
-    query = query % filter_str
-    
-    variables = {
-        "$player_id": player_id,
-        "$start_date": start_date.isoformat() if start_date else None,
-        "$end_date": end_date.isoformat() if end_date else None
-    }
-    
+    query, variables = player_games_query(player_id, start_date, end_date)
     result = await dgraph_service.execute_query(query, variables)
-    return result["player"][0]["participated_in"] if result["player"] else []
+    return result["player"][0].get("participated_in", []) if result["player"] else []
 
-@router.get("/search/{player_name}")
-async def search_players(player_name: str):
+@router.put("/{player_id}/games/{game_id}/stats")
+async def record_player_game_stats(
+    player_id: str,
+    game_id: str,
+    stats: PlayerGameStats,
+    current_user: dict = Depends(get_current_user)
+):
     """
-    Search players by name
+    Record a player's box score for a game; re-recording a game replaces it.
+    Updates the leaderboards as soon as the write commits.
     """
-    query = """
-    query search_players($name: string) {
-        players(func: type(Player)) @filter(regexp(name, $name, "i")) {
-            uid
-            player_id
-            name
-            position
-            season_stats
-            plays_for @facets(since) {
-                uid
-                team_id
-                name
-            }
-        }
-    }
+    values = stats.dict()
+    if not await dgraph_service.record_player_game_stats(player_id, game_id, values):
+        raise HTTPException(status_code=404, detail="Player or game not found")
+    return {"message": "Stats recorded", "player_id": player_id, "game_id": game_id, "stats": values}
+
+@router.get("/search/{player_name}")
+async def search_players(
+    player_name: str,
+    mode: str = Query(default="contains", regex="^(contains|prefix)$"),
+    limit: int = Query(default=10, ge=1, le=100)
+):
     """
-    
-    variables = {"$name": player_name}
-    result = await dgraph_service.execute_query(query, variables)
-    return result["players"] 
\ No newline at end of file
+    Search players by name.
+    contains: case-insensitive substring match via the trigram index
+    (needs 3+ characters; shorter input falls back to prefix).
+    prefix: word-prefix match from the in-memory name index.
+    """
+    if mode == "prefix" or len(player_name) < 3:
+        return player_name_index.search(player_name, limit)
+
+    variables = {"$name": regex_literal(player_name), "$limit": str(limit)}
+    result = await dgraph_service.execute_query(SEARCH_PLAYERS_QUERY, variables)
+    return result["players"]
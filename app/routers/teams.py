@@ -1,101 +1,111 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from typing import List, Optional
 from datetime import datetime
 from ..schemas.team import TeamResponse, TeamCreate, TeamUpdate
+from ..schemas.encoders import encode_team_doc
+from ..responses import trusted_response
 from ..database.mongodb import mongodb
 from ..database.cassandra import cassandra_db
 from bson import ObjectId
+from ..http_cache import make_etag, cache_headers, not_modified_response
+from ..pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
 from ..services.auth import get_current_user
-from ..services.serpapi_service import serpapi_service
-import uuid
+from ..services.identity_registry import identity_registry
+from ..services.standings_service import standings_service
 
 router = APIRouter()
 
 @router.get("/", response_model=List[TeamResponse])
 async def get_teams(
+    request: Request,
+    response: Response,
     conference: Optional[str] = None,
     skip: int = Query(default=0, ge=0),
-    limit: int = Query(default=10, ge=1, le=100)
+    limit: int = Query(default=10, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None, description="Cursor from X-Next-Cursor; replaces skip")
 ):
     """
     Get all teams with optional conference filter and pagination.
-    First tries to fetch from SerpAPI, then falls back to database.
+    Pages are ordered by (conference, position, id); when more rows follow,
+    the X-Next-Cursor header carries the cursor for the next page.
+    Served from the in-memory standings snapshot, falling back to MongoDB
+    until the first snapshot has been built.
     """
-    try:
-        # Normalize conference parameter
-        normalized_conference = conference.upper() if conference else None
-        
-        # First try to fetch from SerpAPI
-        teams = await serpapi_service.fetch_teams(normalized_conference)
-        if teams:
-            # Store teams in MongoDB
-            db = await mongodb.get_db()
-            for team in teams:
-                # Remove id before storing to let MongoDB generate it
-                store_team = team.copy()
-                if 'id' in store_team:
-                    del store_team['id']
-                    
-                await db.teams.update_one(
-                    {"team_name": team["team_name"]},
-                    {"$set": store_team},
-                    upsert=True
-                )
-            
-            # Apply pagination
-            paginated_teams = teams[skip:skip + limit]
-            return [TeamResponse(**team) for team in paginated_teams]
+    # Normalize conference parameter
+    normalized_conference = conference.upper() if conference else None
+    after = tuple(decode_cursor(cursor, length=3)) if cursor else None
+    if after and not (
+        isinstance(after[0], str)
+        and isinstance(after[1], int) and not isinstance(after[1], bool)
+        and isinstance(after[2], str) and ObjectId.is_valid(after[2])
+    ):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
 
-    except Exception as e:
-        print(f"Error fetching teams from SerpAPI: {str(e)}")
+    snapshot = standings_service.snapshot
+    if snapshot is not None:
+        etag = make_etag(snapshot.digest, normalized_conference, skip, limit, after)
+        not_modified = not_modified_response(request, etag, snapshot.created_at)
+        if not_modified:
+            return not_modified
+        content, next_key = snapshot.page(normalized_conference, limit, skip, after)
+        headers = cache_headers(etag, snapshot.created_at)
+        if next_key:
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(list(next_key))
+        return Response(content=content, media_type="application/json", headers=headers)
 
-    # Fallback to database
     db = await mongodb.get_db()
     query = {}
     if normalized_conference:
         query["conference"] = normalized_conference
+    if after:
+        conf, position, last_id = after
+        query["$or"] = [
+            {"conference": {"$gt": conf}},
+            {"conference": conf, "position": {"$gt": position}},
+            {"conference": conf, "position": position, "_id": {"$gt": ObjectId(last_id)}}
+        ]
     
-    cursor = db.teams.find(query).skip(skip).limit(limit)
-    teams = await cursor.to_list(length=limit)
-    
-    # Debug print
-    print(f"Found {len(teams)} teams in database with query: {query}")
-    
-    return [TeamResponse(**{**team, "id": str(team["_id"])}) for team in teams]
+    # The (conference, position) index serves the sort; _id breaks ties
+    cursor = db.teams.find(query).sort([
+        ("conference", 1),
+        ("position", 1),
+        ("_id", 1)
+    ])
+    if not after:
+        cursor = cursor.skip(skip)
+    teams = await cursor.limit(limit + 1).to_list(length=limit + 1)
+
+    headers = {}
+    if len(teams) > limit:
+        teams = teams[:limit]
+        last = teams[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            [last["conference"], last["position"], str(last["_id"])]
+        )
+    return trusted_response([encode_team_doc(team) for team in teams], response, headers)
 
 @router.get("/standings", response_model=List[TeamResponse])
-async def get_standings(conference: Optional[str] = None):
+async def get_standings(request: Request, response: Response, conference: Optional[str] = None):
     """
     Get team standings, optionally filtered by conference.
-    First tries to fetch from SerpAPI, then falls back to database.
+    Served from the in-memory standings snapshot, falling back to MongoDB
+    until the first snapshot has been built.
     """
-    try:
-        # Normalize conference parameter
-        normalized_conference = conference.upper() if conference else None
-        
-        # First try to fetch from SerpAPI
-        teams = await serpapi_service.fetch_teams(normalized_conference)
-        if teams:
-            print(f"Found {len(teams)} teams from SerpAPI")
-            # Store teams in MongoDB
-            db = await mongodb.get_db()
-            for team in teams:
-                # Remove id before storing to let MongoDB generate it
-                store_team = team.copy()
-                if 'id' in store_team:
-                    del store_team['id']
-                    
-                await db.teams.update_one(
-                    {"team_name": team["team_name"]},
-                    {"$set": store_team},
-                    upsert=True
-                )
-            return [TeamResponse(**team) for team in teams]
+    # Normalize conference parameter
+    normalized_conference = conference.upper() if conference else None
 
-    except Exception as e:
-        print(f"Error fetching standings from SerpAPI: {str(e)}")
+    snapshot = standings_service.snapshot
+    if snapshot is not None:
+        etag = make_etag(snapshot.digest, normalized_conference)
+        not_modified = not_modified_response(request, etag, snapshot.created_at)
+        if not_modified:
+            return not_modified
+        return Response(
+            content=snapshot.json(normalized_conference),
+            media_type="application/json",
+            headers=cache_headers(etag, snapshot.created_at)
+        )
 
-    # Fallback to database
     db = await mongodb.get_db()
     query = {}
     if normalized_conference:
@@ -106,8 +116,7 @@ async def get_standings(conference: Optional[str] = None):
         ("position", 1)
     ])
     teams = await cursor.to_list(length=100)
-    print(f"Found {len(teams)} teams in database with query: {query}")
-    return [TeamResponse(**{**team, "id": str(team["_id"])}) for team in teams]
+    return trusted_response([encode_team_doc(team) for team in teams], response)
 
 @router.get("/{team_id}", response_model=TeamResponse)
 async def get_team(team_id: str):
@@ -124,53 +133,21 @@ async def get_team(team_id: str):
 async def get_team_games(
     team_id: str,
     start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None,
-    include_live: bool = Query(default=True, description="Include live games from SerpAPI")
+    end_date: Optional[datetime] = None
 ):
     """
     Get games for a specific team with optional date range.
-    Combines historical data from Cassandra with live data from SerpAPI.
+    Live games are ingested into Cassandra in the background.
+    Accepts either the team's UUID or its MongoDB ID.
     """
-    # Get historical games from Cassandra
-    query = "SELECT * FROM teamgames WHERE team_id = ?"
-    params = [uuid.UUID(team_id)]
-    
+    team_uuid = await identity_registry.resolve_team(team_id)
+    if not team_uuid:
+        raise HTTPException(status_code=404, detail="Team not found")
     if start_date and end_date:
-        query += " AND date >= ? AND date <= ?"
-        params.extend([start_date, end_date])
-    
-    cassandra_games = list(cassandra_db.session.execute(query, params))
-    
-    # If include_live is True and we're looking for current/future games,
-    # fetch additional data from SerpAPI
-    games = cassandra_games
-    if include_live and (
-        not end_date or end_date >= datetime.now().date()
-    ):
-        # Get team details to match with SerpAPI data
-        db = await mongodb.get_db()
-        team = await db.teams.find_one({"_id": ObjectId(team_id)})
-        if not team:
-            raise HTTPException(status_code=404, detail="Team not found")
-            
-        team_name = team.get("team_name")
-        
-        # Fetch live games from SerpAPI
-        live_games = await serpapi_service.fetch_games()
-        
-        # Filter games for the requested team
-        team_live_games = [
-            game for game in live_games
-            if team_name in [game["team1_name"], game["team2_name"]]
-        ]
-        
-        # Combine the results, avoiding duplicates
-        existing_game_ids = {game.game_id for game in cassandra_games}
-        for live_game in team_live_games:
-            if live_game["game_id"] not in existing_game_ids:
-                games.append(live_game)
-    
-    return games
+        return await cassandra_db.execute_async(
+            "select_team_games_in_range", [team_uuid, start_date, end_date]
+        )
+    return await cassandra_db.execute_async("select_team_games", [team_uuid])
 
 @router.get("/search/{team_name}")
 async def search_teams(team_name: str):
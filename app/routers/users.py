@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from typing import List, Optional
+from datetime import datetime
 from bson import ObjectId
+from bson.errors import InvalidId
 from jose import JWTError, jwt
 from ..schemas.user import UserResponse, UserUpdate
+from ..schemas.notification import NotificationResponse
 from ..services.auth import auth_service
+from ..services.notification_service import notification_service
+from ..pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
 from ..database.mongodb import mongodb
 from ..config import get_settings
 from fastapi.security import OAuth2PasswordBearer
@@ -77,4 +82,54 @@ async def remove_favorite_team(
         {"_id": current_user["_id"]},
         {"$pull": {"favorite_teams": team_id}}
     )
-    return {"message": "Team removed from favorites"} 
\ No newline at end of file
+    return {"message": "Team removed from favorites"}
+
+@router.get("/me/notifications", response_model=List[NotificationResponse])
+async def get_notifications(
+    response: Response,
+    unread_only: bool = False,
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None, description="Cursor from X-Next-Cursor"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get the current user's notifications, newest first.
+    When more rows may follow, the X-Next-Cursor header carries the cursor
+    for the next page.
+    """
+    after = None
+    if cursor:
+        date, last_id = decode_cursor(cursor, length=2)
+        try:
+            after = (datetime.fromisoformat(date), ObjectId(last_id))
+        except (TypeError, ValueError, InvalidId):
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+    notifications, has_more = await notification_service.get_user_notifications(
+        str(current_user["_id"]), unread_only, limit, after
+    )
+    if has_more:
+        last = notifications[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            [last["date"].isoformat(), str(last["_id"])]
+        )
+    return notifications
+
+@router.post("/me/notifications/read")
+async def mark_all_notifications_read(current_user: dict = Depends(get_current_user)):
+    updated = await notification_service.mark_all_as_read(str(current_user["_id"]))
+    return {"message": "Notifications marked as read", "updated": updated}
+
+@router.post("/me/notifications/{notification_id}/read")
+async def mark_notification_read(
+    notification_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    if not ObjectId.is_valid(notification_id):
+        raise HTTPException(status_code=404, detail="Notification not found")
+    found = await notification_service.mark_notification_as_read(
+        str(current_user["_id"]), notification_id
+    )
+    if not found:
+        raise HTTPException(status_code=404, detail="Notification not found")
+    return {"message": "Notification marked as read"}
@@ -0,0 +1,42 @@
+"""
+Encoders for rows that come from our own stores.
+
+These build plain dicts with exactly the fields of the response schemas,
+without running Pydantic validation. Only use them for data the
+application wrote itself (Cassandra, MongoDB, Dgraph), never for user input.
+"""
+from cassandra.util import Date
+from .game import GameResponse
+from .player import PlayerResponse
+from .team import TeamResponse
+
+GAME_FIELDS = tuple(GameResponse.__fields__)
+TEAM_FIELDS = tuple(f for f in TeamResponse.__fields__ if f != "id")
+
+def cql_date(value):
+    """The driver returns CQL date columns as cassandra.util.Date; unwrap to datetime.date"""
+    return value.date() if isinstance(value, Date) else value
+
+def encode_game_row(row) -> dict:
+    """Cassandra gamedetails/games_by_id row to a GameResponse-shaped dict"""
+    game = {field: getattr(row, field) for field in GAME_FIELDS}
+    game["date"] = cql_date(game["date"])
+    game["highlight_video_link"] = game["highlight_video_link"] or None
+    return game
+
+def encode_team_doc(doc: dict) -> dict:
+    """MongoDB teams document to a TeamResponse-shaped dict"""
+    team = {field: doc.get(field) for field in TEAM_FIELDS}
+    team["id"] = str(doc["_id"])
+    return team
+
+def encode_player_node(node: dict) -> dict:
+    """Dgraph Player node to a PlayerResponse-shaped dict"""
+    return {
+        "player_id": node.get("player_id"),
+        "name": node.get("name"),
+        "position": node.get("position"),
+        "season_stats": node.get("season_stats"),
+        "current_team": node.get("current_team"),
+        "games_played": node.get("games_played", [])
+    }
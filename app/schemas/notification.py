@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from bson import ObjectId
+from .user import PyObjectId
+
+class NotificationResponse(BaseModel):
+    id: PyObjectId = Field(alias="_id")
+    message: str
+    date: datetime
+    read: bool
+
+    class Config:
+        json_encoders = {
+            ObjectId: str
+        }
+        populate_by_name = True
+        arbitrary_types_allowed = True
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
@@ -33,4 +33,20 @@ class PlayerResponse(PlayerBase):
     games_played: List[PlayerGame] = []
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True
+
+class PlayerGameStats(BaseModel):
+    """One player's full box score for one game; every stat is required"""
+    minutes: float = Field(..., ge=0, le=80)
+    points: int = Field(..., ge=0)
+    rebounds: int = Field(..., ge=0)
+    assists: int = Field(..., ge=0)
+    steals: int = Field(..., ge=0)
+    blocks: int = Field(..., ge=0)
+    turnovers: int = Field(..., ge=0)
+    fgm: int = Field(..., ge=0)
+    fga: int = Field(..., ge=0)
+    fg3m: int = Field(..., ge=0)
+    fg3a: int = Field(..., ge=0)
+    ftm: int = Field(..., ge=0)
+    fta: int = Field(..., ge=0)
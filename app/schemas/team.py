@@ -32,6 +32,7 @@ class TeamUpdate(TeamBase):
 
 class TeamResponse(TeamBase):
     id: str
+    team_uuid: Optional[str] = None
 
     class Config:
         orm_mode = True 
\ No newline at end of file
@@ -1,18 +1,32 @@
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+import asyncio
+from typing import List, Dict, Optional, Sequence
+from datetime import date, datetime, timedelta
+import numpy as np
 from ..database.mongodb import mongodb
 from ..database.cassandra import cassandra_db
-from ..services.dgraph_service import dgraph_service
+from ..schemas.encoders import cql_date
+from ..services.dgraph_service import dgraph_service, STAT_FIELDS
+from ..services.player_queries import player_games_query
+from ..services.player_stats_service import rolling_mean, ema, downsample
+from ..services.serpapi_service import ordered_pair
+from ..services.identity_registry import identity_registry
 
 class AnalyticsService:
     @staticmethod
-    async def get_head_to_head_stats(team1_id: str, team2_id: str) -> Dict:
+    async def get_head_to_head_stats(team1_id: str, team2_id: str) -> Optional[Dict]:
         """Get head-to-head statistics between two teams"""
-        query = """
-        SELECT * FROM teamgames 
-        WHERE team_id = ? AND opponent_team_id = ?
-        """
-        games = cassandra_db.session.execute(query, [team1_id, team2_id])
+        team1_uuid = await identity_registry.resolve_team(team1_id)
+        team2_uuid = await identity_registry.resolve_team(team2_id)
+        if not team1_uuid or not team2_uuid:
+            return None
+
+        team_a, team_b, swapped = ordered_pair(team1_uuid, team2_uuid)
+        totals, recent = await asyncio.gather(
+            cassandra_db.execute_async("select_head_to_head_totals", [team_a, team_b]),
+            cassandra_db.execute_async(
+                "select_head_to_head_recent", [team_a, team_b, 5], all_pages=False
+            )
+        )
         
         stats = {
             "total_games": 0,
@@ -22,55 +36,85 @@ class AnalyticsService:
             "avg_score_team2": 0,
             "last_games": []
         }
-        
-        total_score_team1 = 0
-        total_score_team2 = 0
-        
-        for game in games:
-            stats["total_games"] += 1
-            if game.team_score > game.opponent_score:
-                stats["team1_wins"] += 1
-            else:
-                stats["team2_wins"] += 1
-            total_score_team1 += game.team_score
-            total_score_team2 += game.opponent_score
-            
-            if len(stats["last_games"]) < 5:
-                stats["last_games"].append(game)
-        
-        if stats["total_games"] > 0:
-            stats["avg_score_team1"] = total_score_team1 / stats["total_games"]
-            stats["avg_score_team2"] = total_score_team2 / stats["total_games"]
+
+        if totals and totals[0].total_games:
+            row = totals[0]
+            wins = (row.team_a_wins or 0, row.team_b_wins or 0)
+            points = (row.team_a_points or 0, row.team_b_points or 0)
+            if swapped:
+                wins, points = wins[::-1], points[::-1]
+            stats["total_games"] = row.total_games
+            stats["team1_wins"], stats["team2_wins"] = wins
+            stats["avg_score_team1"] = points[0] / row.total_games
+            stats["avg_score_team2"] = points[1] / row.total_games
+
+        for game in recent:
+            scores = (game.team_a_score, game.team_b_score)
+            if swapped:
+                scores = scores[::-1]
+            stats["last_games"].append({
+                "game_id": game.game_id,
+                "date": cql_date(game.date),
+                "team1_score": scores[0],
+                "team2_score": scores[1],
+                "highlight_video_link": game.highlight_video_link or None
+            })
         
         return stats
 
     @staticmethod
-    async def get_team_performance_trend(team_id: str, last_n_games: int = 10) -> List:
+    async def get_team_performance_trend(team_id: str, last_n_games: int = 10) -> Optional[List]:
         """Get team performance trends over the last N games"""
-        query = """
-        SELECT * FROM teamgames 
-        WHERE team_id = ? 
-        ORDER BY date DESC 
-        LIMIT ?
-        """
-        games = cassandra_db.session.execute(query, [team_id, last_n_games])
-        return list(games)
+        team_uuid = await identity_registry.resolve_team(team_id)
+        if not team_uuid:
+            return None
+        return await cassandra_db.execute_async(
+            "select_team_recent_games", [team_uuid, last_n_games]
+        )
 
     @staticmethod
-    async def get_player_performance_trend(player_id: str) -> Dict:
-        """Get player's performance trends over the season"""
-        query = """
-        query player_trend($player_id: string) {
-            player(func: eq(player_id, $player_id)) {
-                participated_in (orderdesc: date) @facets(stats) {
-                    date
-                    stats
-                }
-            }
-        }
+    async def get_player_performance_trend(
+        player_id: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        stats: Sequence[str] = STAT_FIELDS,
+        window: int = 5,
+        span: int = 10,
+        points: int = 50
+    ) -> Optional[Dict]:
+        """
+        Get a player's per-game trend with rolling and exponential moving
+        averages, downsampled to at most `points` buckets.
+        The date range is applied in Dgraph; the series are returned column-wise.
         """
-        variables = {"$player_id": player_id}
+        query, variables = player_games_query(player_id, start_date, end_date)
         result = await dgraph_service.execute_query(query, variables)
-        return result["player"][0] if result["player"] else None
+        if not result["player"]:
+            return None
+
+        games = result["player"][0].get("participated_in", [])
+        trend = {"player_id": player_id, "games": len(games), "dates": [], "series": {}}
+        if not games:
+            return trend
+
+        values = np.array(
+            [[game.get(f"participated_in|{stat}", 0) for stat in stats] for game in games],
+            dtype=np.float64
+        )
+        columns = {
+            "value": values,
+            "rolling": rolling_mean(values, window),
+            "ema": ema(values, span)
+        }
+        sampled = {}
+        for name, column in columns.items():
+            sampled[name], last_rows = downsample(column, points)
+
+        trend["dates"] = [games[row].get("date") for row in last_rows]
+        trend["series"] = {
+            stat: {name: np.round(column[:, i], 2).tolist() for name, column in sampled.items()}
+            for i, stat in enumerate(stats)
+        }
+        return trend
 
 analytics_service = AnalyticsService() 
\ No newline at end of file
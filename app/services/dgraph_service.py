@@ -1,10 +1,202 @@
-from typing import List, Optional
+from typing import Callable, List, Optional
 import json
+import time
 from datetime import datetime
 from ..database.dgraph import dgraph_db
+from ..http_cache import etag_from_bytes
 import pydgraph
 
+# Per-game player stats, stored as numeric facets on participated_in edges
+STAT_FIELDS = (
+    "minutes", "points", "rebounds", "assists", "steals", "blocks", "turnovers",
+    "fgm", "fga", "fg3m", "fg3a", "ftm", "fta"
+)
+
 class DgraphService:
+    # Called as listener(player, game, stats) after a box score is stored,
+    # with player {player_id, name} and game {game_id, date}
+    stats_listeners: List[Callable] = []
+
+    # Blocking pydgraph helpers; always called through dgraph_db.run()
+    @staticmethod
+    def _query(query: str, variables: dict = None):
+        txn = dgraph_db.client.txn(read_only=True)
+        try:
+            response = txn.query(query, variables=variables)
+            return json.loads(response.json), response.json
+        finally:
+            txn.discard()
+
+    @staticmethod
+    def _mutate(set_obj):
+        txn = dgraph_db.client.txn()
+        try:
+            response = txn.mutate(set_obj=set_obj)
+            txn.commit()
+            return response
+        finally:
+            txn.discard()
+
+    @staticmethod
+    def _upsert(query: str, mutations: list, max_retries: int):
+        """
+        Run one upsert block, retrying aborted transactions.
+        Returns (retries used, response JSON of the named query blocks).
+        """
+        for attempt in range(max_retries + 1):
+            txn = dgraph_db.client.txn()
+            try:
+                request = txn.create_request(
+                    query=query,
+                    mutations=[txn.create_mutation(**mutation) for mutation in mutations],
+                    commit_now=True
+                )
+                response = txn.do_request(request)
+                return attempt, json.loads(response.json or b"{}")
+            except pydgraph.errors.AbortedError:
+                if attempt == max_retries:
+                    raise
+                time.sleep(0.05 * 2 ** attempt)
+            finally:
+                txn.discard()
+
+    @staticmethod
+    def _literal(value) -> str:
+        # JSON string escaping is valid N-Quad/DQL string escaping
+        return json.dumps(str(value))
+
+    @staticmethod
+    def _teams_upsert(teams: List[dict]):
+        query_blocks = []
+        nquads = []
+        for i, team in enumerate(teams):
+            var = f"t{i}"
+            query_blocks.append(f"{var} as var(func: eq(team_id, {DgraphService._literal(team['team_id'])}))")
+            nquads.append(f'uid({var}) <dgraph.type> "Team" .')
+            for predicate in ("team_id", "name"):
+                if team.get(predicate) is not None:
+                    nquads.append(f"uid({var}) <{predicate}> {DgraphService._literal(team[predicate])} .")
+        return "{\n" + "\n".join(query_blocks) + "\n}", [{"set_nquads": "\n".join(nquads)}]
+
+    @staticmethod
+    def _players_upsert(players: List[dict]):
+        query_blocks = []
+        nquads = []
+        team_vars = {}
+        edges = {}
+        for i, player in enumerate(players):
+            var = f"p{i}"
+            query_blocks.append(f"{var} as var(func: eq(player_id, {DgraphService._literal(player['player_id'])}))")
+            nquads.append(f'uid({var}) <dgraph.type> "Player" .')
+            for predicate in ("player_id", "name", "position", "season_stats"):
+                if player.get(predicate) is not None:
+                    nquads.append(f"uid({var}) <{predicate}> {DgraphService._literal(player[predicate])} .")
+
+            team_id = player.get("team_id")
+            if not team_id:
+                continue
+            if team_id not in team_vars:
+                team_var = f"t{len(team_vars)}"
+                team_vars[team_id] = team_var
+                query_blocks.append(f"{team_var} as var(func: eq(team_id, {DgraphService._literal(team_id)}))")
+                edges[team_var] = []
+            team_var = team_vars[team_id]
+            facet = f" (since={player['since']})" if player.get("since") else ""
+            edges[team_var].append(f"uid({var}) <plays_for> uid({team_var}){facet} .")
+            edges[team_var].append(f"uid({team_var}) <has_players> uid({var}) .")
+
+        mutations = [{"set_nquads": "\n".join(nquads)}]
+        # Only link to teams that exist, so a typo never creates an empty Team node
+        for team_var, team_edges in edges.items():
+            mutations.append({
+                "set_nquads": "\n".join(team_edges),
+                "cond": f"@if(eq(len({team_var}), 1))"
+            })
+        return "{\n" + "\n".join(query_blocks) + "\n}", mutations
+
+    @staticmethod
+    async def import_roster(teams: List[dict], players: List[dict],
+                            chunk_size: int = 100, max_retries: int = 5) -> dict:
+        """
+        Bulk import teams, players and plays_for edges in chunked upsert blocks.
+
+        Nodes are matched on team_id / player_id, so re-running an import
+        updates existing nodes instead of duplicating them. Teams are written
+        first; a player's team_id must refer to an imported or existing team.
+        Args:
+            teams: [{"team_id", "name"}]
+            players: [{"player_id", "name", "position", "season_stats",
+                       "team_id" (optional), "since" (optional ISO datetime)}]
+        """
+        started = time.perf_counter()
+        report = {"teams": 0, "players": 0, "edges": 0, "chunks": 0, "retries": 0, "failures": []}
+
+        batches = [
+            ("teams", "team_id", teams[i:i + chunk_size], DgraphService._teams_upsert)
+            for i in range(0, len(teams), chunk_size)
+        ] + [
+            ("players", "player_id", players[i:i + chunk_size], DgraphService._players_upsert)
+            for i in range(0, len(players), chunk_size)
+        ]
+        for kind, key, chunk, build in batches:
+            query, mutations = build(chunk)
+            try:
+                retries, _ = await dgraph_db.run(
+                    DgraphService._upsert, query, mutations, max_retries
+                )
+                report["retries"] += retries
+            except Exception as e:
+                report["failures"].append({"kind": kind, "ids": [row[key] for row in chunk], "error": str(e)})
+                continue
+            report["chunks"] += 1
+            report[kind] += len(chunk)
+            if kind == "players":
+                report["edges"] += sum(1 for player in chunk if player.get("team_id"))
+
+        elapsed = time.perf_counter() - started
+        report["elapsed_seconds"] = elapsed
+        report["nodes_per_second"] = (report["teams"] + report["players"]) / elapsed if elapsed > 0 else 0.0
+        return report
+
+    @staticmethod
+    async def record_player_game_stats(player_id: str, game_id: str, stats: dict) -> bool:
+        """
+        Store a player's box score for one game as typed numeric facets on the
+        participated_in edge (and link the game back to the player).
+        The box score must be complete: readers count a missing facet as 0,
+        so unknown or missing stat names are rejected. Re-recording a game
+        overwrites it. Returns False when the player or game does not exist.
+        """
+        unknown = set(stats) - set(STAT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown stat fields: {', '.join(sorted(unknown))}")
+        missing = [stat for stat in STAT_FIELDS if stat not in stats]
+        if missing:
+            raise ValueError(f"Missing stat fields: {', '.join(missing)}")
+
+        facets = ", ".join(
+            f"{stat}={float(stats[stat]) if stat == 'minutes' else int(stats[stat])}"
+            for stat in STAT_FIELDS
+        )
+        query = (
+            "{\n"
+            f"p as var(func: eq(player_id, {DgraphService._literal(player_id)}))\n"
+            f"g as var(func: eq(game_id, {DgraphService._literal(game_id)}))\n"
+            "player(func: uid(p)) { player_id name }\n"
+            "game(func: uid(g)) { game_id date }\n"
+            "}"
+        )
+        mutations = [{
+            "set_nquads": f"uid(p) <participated_in> uid(g) ({facets}) .\nuid(g) <players> uid(p) .",
+            "cond": "@if(eq(len(p), 1) AND eq(len(g), 1))"
+        }]
+        _, found = await dgraph_db.run(DgraphService._upsert, query, mutations, 5)
+        if len(found.get("player", [])) != 1 or len(found.get("game", [])) != 1:
+            return False
+        for listener in DgraphService.stats_listeners:
+            listener(found["player"][0], found["game"][0], stats)
+        return True
+
     @staticmethod
     async def create_player(player_data: dict) -> dict:
         mutation = {
@@ -16,16 +208,15 @@ class DgraphService:
                 }
             ]
         }
-        try:
-            txn = dgraph_db.client.txn()
-            response = txn.mutate(set_obj=mutation)
-            txn.commit()
-            return {"uid": response.uids["player"]}
-        finally:
-            txn.discard()
+        response = await dgraph_db.run(DgraphService._mutate, mutation["set"])
+        return {"uid": response.uids["player"]}
 
     @staticmethod
-    async def get_player(player_id: str) -> Optional[dict]:
+    async def get_player(player_id: str, with_etag: bool = False):
+        """
+        Get a player with their teams and games.
+        With with_etag, returns (player, etag) hashed from Dgraph's raw response.
+        """
         query = """
         query player($player_id: string) {
             player(func: eq(player_id, $player_id)) {
@@ -39,7 +230,7 @@ class DgraphService:
                     team_id
                     name
                 }
-                participated_in @facets(stats) {
+                participated_in @facets {
                     uid
                     game_id
                     date
@@ -51,13 +242,13 @@ class DgraphService:
         }
         """
         variables = {"$player_id": player_id}
-        try:
-            txn = dgraph_db.client.txn(read_only=True)
-            response = txn.query(query, variables=variables)
-            players = json.loads(response.json)["player"]
-            return players[0] if players else None
-        finally:
-            txn.discard()
+        result, raw = await dgraph_db.run(DgraphService._query, query, variables)
+        players = result["player"]
+        if not players:
+            return None
+        if with_etag:
+            return players[0], etag_from_bytes(raw)
+        return players[0]
 
     @staticmethod
     async def link_player_to_team(player_id: str, team_id: str, since: datetime):
@@ -72,20 +263,11 @@ class DgraphService:
                 }
             ]
         }
-        try:
-            txn = dgraph_db.client.txn()
-            txn.mutate(set_obj=mutation)
-            txn.commit()
-        finally:
-            txn.discard()
+        await dgraph_db.run(DgraphService._mutate, mutation["set"])
 
     @staticmethod
     async def execute_query(query: str, variables: dict = None) -> dict:
-        try:
-            txn = dgraph_db.client.txn(read_only=True)
-            response = txn.query(query, variables=variables)
-            return json.loads(response.json)
-        finally:
-            txn.discard()
+        result, _ = await dgraph_db.run(DgraphService._query, query, variables)
+        return result
 
-dgraph_service = DgraphService() 
\ No newline at end of file
+dgraph_service = DgraphService()
@@ -0,0 +1,115 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import List
+from pymongo.errors import BulkWriteError
+from ..database.mongodb import mongodb
+from ..config import get_settings
+from .notification_service import notification_service, upcoming_game_message
+
+settings = get_settings()
+
+class NotificationFanout:
+    """
+    Writes one notification to every follower of either team in a game.
+
+    A producer streams follower ids off the users.favorite_teams multikey
+    index and groups them into batches; a pool of workers drains the bounded
+    queue with unordered insert_many calls, so reading followers and writing
+    notifications overlap and memory stays at queue_size batches.
+    """
+    def __init__(self):
+        self.totals = {"fanouts": 0, "notified": 0, "failed": 0, "batches": 0}
+        self.last_report = None
+
+    @staticmethod
+    async def follow_keys(game: dict) -> List[str]:
+        """
+        Every id a user may have stored in favorite_teams for the game's teams:
+        the team UUIDs plus the teams' MongoDB ids
+        """
+        keys = {str(game["team1_id"]), str(game["team2_id"])}
+        db = await mongodb.get_db()
+        cursor = db.teams.find(
+            {"$or": [
+                {"team_uuid": {"$in": list(keys)}},
+                {"team_name": {"$in": [game["team1_name"], game["team2_name"]]}}
+            ]},
+            {"_id": 1}
+        )
+        async for team in cursor:
+            keys.add(str(team["_id"]))
+        return sorted(keys)
+
+    async def _produce(self, queue: asyncio.Queue, keys: List[str], message: str,
+                       batch_size: int, report: dict):
+        db = await mongodb.get_db()
+        now = datetime.utcnow()
+        cursor = db.users.find(
+            {"favorite_teams": {"$in": keys}}, {"_id": 1}
+        ).batch_size(batch_size)
+        batch = []
+        async for user in cursor:
+            batch.append(notification_service.new_notification(user["_id"], message, now))
+            if len(batch) >= batch_size:
+                await queue.put(batch)
+                report["followers"] += len(batch)
+                batch = []
+        if batch:
+            await queue.put(batch)
+            report["followers"] += len(batch)
+
+    @staticmethod
+    async def _consume(queue: asyncio.Queue, report: dict):
+        db = await mongodb.get_db()
+        while True:
+            batch = await queue.get()
+            try:
+                result = await db.notifications.insert_many(batch, ordered=False)
+                report["notified"] += len(result.inserted_ids)
+            except BulkWriteError as e:
+                inserted = e.details.get("nInserted", 0)
+                report["notified"] += inserted
+                report["failed"] += len(batch) - inserted
+            except Exception as e:
+                print(f"Error writing notification batch: {str(e)}")
+                report["failed"] += len(batch)
+            finally:
+                report["batches"] += 1
+                queue.task_done()
+
+    async def notify_game_followers(self, game: dict, message: str = None,
+                                    batch_size: int = None, workers: int = None) -> dict:
+        """Notify all followers of either team about an upcoming game"""
+        message = message or upcoming_game_message(game)
+        batch_size = batch_size or settings.FANOUT_BATCH_SIZE
+        workers = workers or settings.FANOUT_WORKERS
+        report = {"game_id": str(game.get("game_id")), "followers": 0, "notified": 0,
+                  "failed": 0, "batches": 0}
+        started = time.perf_counter()
+
+        queue = asyncio.Queue(maxsize=settings.FANOUT_QUEUE_SIZE)
+        consumers = [asyncio.create_task(self._consume(queue, report)) for _ in range(workers)]
+        try:
+            keys = await self.follow_keys(game)
+            await self._produce(queue, keys, message, batch_size, report)
+            await queue.join()
+        finally:
+            for consumer in consumers:
+                consumer.cancel()
+            await asyncio.gather(*consumers, return_exceptions=True)
+
+        elapsed = time.perf_counter() - started
+        report["elapsed_seconds"] = elapsed
+        report["notifications_per_second"] = report["notified"] / elapsed if elapsed > 0 else 0.0
+
+        self.totals["fanouts"] += 1
+        for key in ("notified", "failed", "batches"):
+            self.totals[key] += report[key]
+        self.last_report = report
+        return report
+
+    def stats(self) -> dict:
+        return {**self.totals, "last": self.last_report}
+
+notification_fanout = NotificationFanout()
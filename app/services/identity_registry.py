@@ -0,0 +1,70 @@
+import uuid
+from datetime import date
+from typing import Optional
+from bson import ObjectId
+from ..database.mongodb import mongodb
+
+# Fixed namespaces so the same team or game always maps to the same UUID
+TEAM_NAMESPACE = uuid.UUID("6f1c2a5e-3b7d-4c1e-9a8f-2d4b6e8a0c13")
+GAME_NAMESPACE = uuid.UUID("a83e5d71-0f2c-4b69-8e14-7c5a9b3d2f60")
+
+class IdentityRegistry:
+    """
+    Stable UUIDs for teams and games.
+
+    Team ids are derived from the normalized team name, cached in memory and
+    persisted on the team's MongoDB document as team_uuid. An id already
+    persisted there always wins, so existing history keeps its partition.
+    Game ids are derived from the natural key (date, team1, team2), which
+    makes re-ingesting the same game an idempotent upsert.
+    """
+    def __init__(self):
+        self._teams = {}
+
+    @staticmethod
+    def normalize(team_name: str) -> str:
+        return " ".join(team_name.lower().split())
+
+    def team_id(self, team_name: str) -> uuid.UUID:
+        key = self.normalize(team_name)
+        team_uuid = self._teams.get(key)
+        if team_uuid is None:
+            team_uuid = uuid.uuid5(TEAM_NAMESPACE, key)
+            self._teams[key] = team_uuid
+        return team_uuid
+
+    @staticmethod
+    def game_id(game_date: date, team1_id: uuid.UUID, team2_id: uuid.UUID) -> uuid.UUID:
+        return uuid.uuid5(GAME_NAMESPACE, f"{game_date.isoformat()}|{team1_id}|{team2_id}")
+
+    async def load(self):
+        """Warm the cache with the ids persisted in MongoDB"""
+        db = await mongodb.get_db()
+        cursor = db.teams.find(
+            {"team_uuid": {"$exists": True}},
+            {"team_name": 1, "team_uuid": 1}
+        )
+        async for team in cursor:
+            self._teams[self.normalize(team["team_name"])] = uuid.UUID(team["team_uuid"])
+
+    async def resolve_team(self, team_id: str) -> Optional[uuid.UUID]:
+        """Accept either a team UUID or a MongoDB team _id"""
+        try:
+            return uuid.UUID(team_id)
+        except ValueError:
+            pass
+        if not ObjectId.is_valid(team_id):
+            return None
+
+        db = await mongodb.get_db()
+        team = await db.teams.find_one(
+            {"_id": ObjectId(team_id)},
+            {"team_name": 1, "team_uuid": 1}
+        )
+        if not team:
+            return None
+        if team.get("team_uuid"):
+            return uuid.UUID(team["team_uuid"])
+        return self.team_id(team["team_name"])
+
+identity_registry = IdentityRegistry()
@@ -0,0 +1,99 @@
+import asyncio
+import re
+from datetime import datetime, timezone
+from typing import List
+from zoneinfo import ZoneInfo
+from ..config import get_settings
+from .serpapi_service import serpapi_service
+from .standings_service import standings_service
+from .live_scores import live_score_hub
+
+settings = get_settings()
+
+# Stage text SerpAPI uses for games in progress, e.g. "Q3 5:21", "Halftime", "OT"
+LIVE_STAGE_PATTERN = re.compile(
+    r"\b(q[1-4]|[1-4](st|nd|rd|th)|half(time)?|\d?ot|end of|live)\b",
+    re.IGNORECASE
+)
+
+def is_live(stage: str) -> bool:
+    if not stage or stage.lower().startswith("final"):
+        return False
+    return bool(LIVE_STAGE_PATTERN.search(stage))
+
+class IngestionScheduler:
+    """
+    Polls SerpAPI in the background and writes the results to the databases,
+    so the read endpoints never call SerpAPI on the request path.
+
+    The scoreboard is polled quickly while games are live, slowly otherwise,
+    and both jobs back off overnight.
+    """
+    def __init__(self):
+        self._tasks: List[asyncio.Task] = []
+        self.live_games = 0
+        self.last_scoreboard_refresh = None
+        self.last_standings_refresh = None
+
+    @staticmethod
+    def _is_overnight(now: datetime) -> bool:
+        """Whether now falls in the overnight window, in GAME_TIMEZONE hours"""
+        hour = now.astimezone(ZoneInfo(settings.GAME_TIMEZONE)).hour
+        start, end = settings.OVERNIGHT_START_HOUR, settings.OVERNIGHT_END_HOUR
+        if start <= end:
+            return start <= hour < end
+        return hour >= start or hour < end
+
+    def scoreboard_interval(self, now: datetime) -> int:
+        if self.live_games:
+            return settings.SCOREBOARD_LIVE_INTERVAL
+        if self._is_overnight(now):
+            return settings.SCOREBOARD_OVERNIGHT_INTERVAL
+        return settings.SCOREBOARD_IDLE_INTERVAL
+
+    def standings_interval(self, now: datetime) -> int:
+        if self._is_overnight(now):
+            return settings.STANDINGS_OVERNIGHT_INTERVAL
+        return settings.STANDINGS_INTERVAL
+
+    async def refresh_scoreboard(self):
+        """Fetch today's scoreboard, store it in Cassandra and push changes to live clients"""
+        games = await serpapi_service.fetch_games(store_in_db=True)
+        live_score_hub.publish(games)
+        self.live_games = sum(1 for game in games if is_live(game["stage"]))
+        self.last_scoreboard_refresh = datetime.now()
+        return games
+
+    async def refresh_standings(self):
+        """Fetch standings and store them in MongoDB"""
+        teams = await serpapi_service.fetch_teams()
+        if teams:
+            await standings_service.store_teams(teams)
+        self.last_standings_refresh = datetime.now()
+        return teams
+
+    async def _run(self, name, job, interval):
+        while True:
+            try:
+                await job()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error in {name} ingestion: {str(e)}")
+            await asyncio.sleep(interval(datetime.now(timezone.utc)))
+
+    def start(self):
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._run("scoreboard", self.refresh_scoreboard, self.scoreboard_interval)),
+            asyncio.create_task(self._run("standings", self.refresh_standings, self.standings_interval))
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+ingestion_scheduler = IngestionScheduler()
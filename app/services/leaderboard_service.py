@@ -0,0 +1,145 @@
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import math
+import numpy as np
+from ..config import get_settings
+from .dgraph_service import dgraph_service, STAT_FIELDS
+from .player_stats_service import player_stats_service, current_season, season_bounds
+
+settings = get_settings()
+
+class _Board:
+    """One category, kept sorted by (-per_game, player_id)"""
+    __slots__ = ("entries", "keys")
+
+    def __init__(self):
+        self.entries: List[Tuple[float, str]] = []
+        self.keys: Dict[str, Tuple[float, str]] = {}
+
+    def update(self, player_id: str, value: float):
+        old = self.keys.get(player_id)
+        if old is not None:
+            del self.entries[bisect_left(self.entries, old)]
+        key = (-value, player_id)
+        insort(self.entries, key)
+        self.keys[player_id] = key
+
+    def top(self, limit: int, qualifies=None) -> List[Tuple[float, str]]:
+        if qualifies is None:
+            return self.entries[:limit]
+        top = []
+        for entry in self.entries:
+            if qualifies(entry[1]):
+                top.append(entry)
+                if len(top) == limit:
+                    break
+        return top
+
+class Leaderboards:
+    """
+    Per-game-average leaders for the current season, one sorted board per
+    stat category.
+
+    Each player keeps a running total vector and the per-game rows behind
+    it, so a box score (new or re-recorded) adjusts the total in place and
+    moves the player to its new position on every board with one bisect.
+    Reads never touch Dgraph. When the calendar moves into a new season the
+    boards start empty and are rebuilt from Dgraph in the background.
+    """
+    def __init__(self):
+        self._reset(current_season())
+        self._rebuild_task: Optional[asyncio.Task] = None
+        dgraph_service.stats_listeners.append(self._on_stats)
+
+    def _reset(self, season: int):
+        self.season = season
+        self._boards = {stat: _Board() for stat in STAT_FIELDS}
+        self._totals: Dict[str, np.ndarray] = {}
+        self._games: Dict[str, Dict[str, np.ndarray]] = {}
+        self._names: Dict[str, Optional[str]] = {}
+
+    def _check_season(self):
+        season = current_season()
+        if season == self.season:
+            return
+        self._reset(season)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._rebuild_task = loop.create_task(self.rebuild(season))
+        self._rebuild_task.add_done_callback(self._log_rebuild_error)
+
+    @staticmethod
+    def _log_rebuild_error(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Error rebuilding player leaderboards: {str(task.exception())}")
+
+    async def rebuild(self, season: Optional[int] = None):
+        """Reload the season from Dgraph and rebuild every board"""
+        season = current_season() if season is None else season
+        stats = await player_stats_service.load_season(season, refresh=True)
+        matrix = np.column_stack([stats.columns[stat] for stat in STAT_FIELDS]) \
+            if stats.game_ids else np.zeros((0, len(STAT_FIELDS)))
+
+        games: Dict[str, Dict[str, np.ndarray]] = {}
+        for row, (index, game_id) in enumerate(zip(stats.player_index, stats.game_ids)):
+            games.setdefault(stats.player_ids[index], {})[game_id] = matrix[row]
+
+        self._reset(season)
+        self._games = games
+        self._names = dict(zip(stats.player_ids, stats.names))
+        for player_id, rows in games.items():
+            self._totals[player_id] = np.sum(list(rows.values()), axis=0)
+            self._rank(player_id)
+
+    def record(self, player_id: str, name: Optional[str], game_id: str, stats: dict):
+        """Apply one player's box score for a game of the current season"""
+        row = np.array([float(stats.get(stat, 0)) for stat in STAT_FIELDS])
+        games = self._games.setdefault(player_id, {})
+        previous = games.get(game_id)
+        total = self._totals.get(player_id, np.zeros(len(STAT_FIELDS)))
+        self._totals[player_id] = total + row - (previous if previous is not None else 0)
+        games[game_id] = row
+        if name:
+            self._names[player_id] = name
+        self._rank(player_id)
+
+    def _rank(self, player_id: str):
+        per_game = self._totals[player_id] / len(self._games[player_id])
+        for stat, value in zip(STAT_FIELDS, per_game):
+            self._boards[stat].update(player_id, float(value))
+
+    def _on_stats(self, player: dict, game: dict, stats: dict):
+        self._check_season()
+        game_date = game.get("date")
+        if game_date:
+            day = datetime.fromisoformat(game_date.replace("Z", "+00:00")).date()
+            start, end = season_bounds(self.season)
+            if not start <= day <= end:
+                return
+        self.record(player["player_id"], player.get("name"), game["game_id"], stats)
+
+    def qualifying_games(self) -> int:
+        """Games needed to rank: LEADERBOARD_MIN_GAMES_SHARE of the most games anyone has played"""
+        most = max((len(games) for games in self._games.values()), default=0)
+        return max(1, math.ceil(most * settings.LEADERBOARD_MIN_GAMES_SHARE))
+
+    def leaders(self, category: str, limit: int = 25, min_games: Optional[int] = None) -> List[dict]:
+        self._check_season()
+        min_games = self.qualifying_games() if min_games is None else min_games
+        qualifies = lambda player_id: len(self._games[player_id]) >= min_games
+        return [
+            {
+                "rank": rank,
+                "player_id": player_id,
+                "name": self._names.get(player_id),
+                "games": len(self._games[player_id]),
+                "per_game": round(-value, 2) + 0.0
+            }
+            for rank, (value, player_id) in enumerate(self._boards[category].top(limit, qualifies), start=1)
+        ]
+
+leaderboards = Leaderboards()
@@ -0,0 +1,142 @@
+import asyncio
+from datetime import date
+from typing import Dict, List, Optional, Set
+import orjson
+from ..config import get_settings
+
+settings = get_settings()
+
+# Fields pushed to clients when they change
+LIVE_FIELDS = ("stage", "team1_score", "team2_score", "highlight_video_link")
+
+def date_topic(game_date: date) -> str:
+    return f"date:{game_date.isoformat()}"
+
+def team_topic(team_id) -> str:
+    return f"team:{team_id}"
+
+class Subscription:
+    """
+    One client's view of the hub: a bounded queue of encoded messages.
+    A client that lets the queue fill up is dropped instead of slowing
+    down the broadcast for everyone else.
+    """
+    __slots__ = ("topic", "queue", "dropped")
+
+    def __init__(self, topic: str, max_queue: int):
+        self.topic = topic
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = False
+
+    def offer(self, message: bytes) -> bool:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped = True
+            return False
+        return True
+
+    async def get(self) -> Optional[bytes]:
+        """Next message, or None once the subscription has been dropped"""
+        if self.dropped:
+            return None
+        return await self.queue.get()
+
+class LiveScoreHub:
+    """
+    Broadcasts scoreboard changes to subscribers of a date or a team.
+
+    Each publish compares the new scoreboard to the last one and keeps only
+    the fields that changed. The changes for a topic are encoded once and
+    the same bytes are offered to every subscriber of that topic, so one
+    upstream refresh costs one diff and one encode per topic however many
+    clients are connected.
+    """
+    def __init__(self, max_queue: int = 32):
+        self.max_queue = max_queue
+        self._games: Dict[str, dict] = {}
+        self._topics: Dict[str, Set[Subscription]] = {}
+        self.counters = {"publishes": 0, "messages": 0, "deliveries": 0, "dropped": 0}
+
+    @staticmethod
+    def _state(game: dict) -> dict:
+        return {
+            "game_id": str(game["game_id"]),
+            "date": game["date"].isoformat(),
+            "team1_id": str(game["team1_id"]),
+            "team1_name": game["team1_name"],
+            "team2_id": str(game["team2_id"]),
+            "team2_name": game["team2_name"],
+            **{field: game[field] for field in LIVE_FIELDS}
+        }
+
+    @staticmethod
+    def _topics_for(game: dict) -> List[str]:
+        return [date_topic(game["date"]), team_topic(game["team1_id"]), team_topic(game["team2_id"])]
+
+    def subscribe(self, topic: str) -> Subscription:
+        """
+        Register a subscriber. Its queue starts with the full current state
+        of every game in the topic, followed by changes only.
+        """
+        subscription = Subscription(topic, self.max_queue)
+        snapshot = [
+            state for state in self._games.values()
+            if topic in (f"date:{state['date']}", team_topic(state["team1_id"]), team_topic(state["team2_id"]))
+        ]
+        subscription.offer(orjson.dumps({"type": "snapshot", "games": snapshot}))
+        self._topics.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self._topics.get(subscription.topic)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._topics[subscription.topic]
+
+    def publish(self, games: List[dict]) -> int:
+        """Diff a fresh scoreboard against the last one and broadcast the changes"""
+        changes: Dict[str, List[dict]] = {}
+        for game in games:
+            state = self._state(game)
+            previous = self._games.get(state["game_id"])
+            self._games[state["game_id"]] = state
+            if previous is None:
+                diff = state
+            else:
+                diff = {field: state[field] for field in LIVE_FIELDS if previous[field] != state[field]}
+                if not diff:
+                    continue
+                diff["game_id"] = state["game_id"]
+            for topic in self._topics_for(game):
+                if topic in self._topics:
+                    changes.setdefault(topic, []).append(diff)
+
+        if games:
+            # Forget finished days once the scoreboard has moved on
+            oldest = min(game["date"] for game in games).isoformat()
+            for game_id in [k for k, v in self._games.items() if v["date"] < oldest]:
+                del self._games[game_id]
+
+        self.counters["publishes"] += 1
+        for topic, diffs in changes.items():
+            message = orjson.dumps({"type": "update", "games": diffs})
+            self.counters["messages"] += 1
+            for subscription in list(self._topics.get(topic, ())):
+                if subscription.offer(message):
+                    self.counters["deliveries"] += 1
+                else:
+                    self.counters["dropped"] += 1
+                    self.unsubscribe(subscription)
+        return len(changes)
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "topics": len(self._topics),
+            "subscribers": sum(len(subscribers) for subscribers in self._topics.values()),
+            "games": len(self._games)
+        }
+
+live_score_hub = LiveScoreHub(settings.LIVE_QUEUE_SIZE)
@@ -1,55 +1,96 @@
-from typing import List
-from datetime import datetime
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta
 from ..database.mongodb import mongodb
+from ..config import get_settings
 from bson import ObjectId
 
+settings = get_settings()
+
+def upcoming_game_message(game_data: dict) -> str:
+    return f"Upcoming game: {game_data['team1_name']} vs {game_data['team2_name']} on {game_data['date']}"
+
 class NotificationService:
+    """
+    Notifications live in their own collection, one document per
+    notification, indexed on (user_id, read, date, _id) and expired by a
+    TTL index on expires_at.
+    """
     @staticmethod
-    async def create_notification(user_id: str, message: str):
-        """Create a new notification for a user"""
-        notification = {
+    def new_notification(user_id: ObjectId, message: str, now: Optional[datetime] = None) -> dict:
+        now = now or datetime.utcnow()
+        return {
+            "user_id": user_id,
             "message": message,
-            "date": datetime.utcnow(),
-            "read": False
+            "date": now,
+            "read": False,
+            "expires_at": now + timedelta(days=settings.NOTIFICATION_TTL_DAYS)
         }
-        
+
+    @staticmethod
+    async def create_notification(user_id: str, message: str):
+        """Create a new notification for a user"""
+        notification = NotificationService.new_notification(ObjectId(user_id), message)
         db = await mongodb.get_db()
-        await db.users.update_one(
-            {"_id": ObjectId(user_id)},
-            {"$push": {"notifications": notification}}
-        )
+        result = await db.notifications.insert_one(notification)
+        notification["_id"] = result.inserted_id
         return notification
 
     @staticmethod
-    async def mark_notification_as_read(user_id: str, notification_date: datetime):
+    async def mark_notification_as_read(user_id: str, notification_id: str) -> bool:
         """Mark a notification as read"""
         db = await mongodb.get_db()
-        await db.users.update_one(
-            {
-                "_id": ObjectId(user_id),
-                "notifications.date": notification_date
-            },
-            {"$set": {"notifications.$.read": True}}
+        result = await db.notifications.update_one(
+            {"_id": ObjectId(notification_id), "user_id": ObjectId(user_id)},
+            {"$set": {"read": True}}
         )
+        return result.matched_count == 1
 
     @staticmethod
-    async def get_user_notifications(user_id: str, unread_only: bool = False) -> List:
-        """Get user notifications"""
+    async def mark_all_as_read(user_id: str) -> int:
+        """Mark every unread notification of a user as read; returns how many changed"""
         db = await mongodb.get_db()
-        user = await db.users.find_one({"_id": ObjectId(user_id)})
-        if not user:
-            return []
-        
-        notifications = user.get("notifications", [])
-        if unread_only:
-            notifications = [n for n in notifications if not n["read"]]
-        
-        return sorted(notifications, key=lambda x: x["date"], reverse=True)
+        result = await db.notifications.update_many(
+            {"user_id": ObjectId(user_id), "read": False},
+            {"$set": {"read": True}}
+        )
+        return result.modified_count
+
+    @staticmethod
+    async def get_user_notifications(
+        user_id: str,
+        unread_only: bool = False,
+        limit: int = 20,
+        after: Optional[Tuple[datetime, ObjectId]] = None
+    ) -> Tuple[List, bool]:
+        """
+        Get a page of user notifications, newest first.
+        `after` is the (date, _id) of the last notification already seen.
+        Returns (notifications, whether more may follow).
+        """
+        db = await mongodb.get_db()
+        # Matching read on both values lets MongoDB merge the two index ranges
+        # in date order instead of sorting in memory
+        query = {
+            "user_id": ObjectId(user_id),
+            "read": False if unread_only else {"$in": [False, True]}
+        }
+        if after:
+            date, last_id = after
+            query["$or"] = [
+                {"date": {"$lt": date}},
+                {"date": date, "_id": {"$lt": last_id}}
+            ]
+
+        cursor = db.notifications.find(query, {"user_id": 0, "expires_at": 0}).sort([
+            ("date", -1),
+            ("_id", -1)
+        ])
+        notifications = await cursor.limit(limit + 1).to_list(length=limit + 1)
+        return notifications[:limit], len(notifications) > limit
 
     @staticmethod
     async def notify_favorite_team_game(user_id: str, team_id: str, game_data: dict):
         """Notify user about their favorite team's upcoming game"""
-        message = f"Upcoming game: {game_data['team1_name']} vs {game_data['team2_name']} on {game_data['date']}"
-        await NotificationService.create_notification(user_id, message)
+        await NotificationService.create_notification(user_id, upcoming_game_message(game_data))
 
-notification_service = NotificationService() 
\ No newline at end of file
+notification_service = NotificationService()
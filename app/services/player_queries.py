@@ -0,0 +1,118 @@
+"""
+Precompiled DQL for the players router.
+
+Every filter combination is rendered once at import time, so a request only
+picks a string out of a dict. Each text declares exactly the variables it
+uses (Dgraph rejects unused ones) and puts pagination in the root function,
+which is the only place Dgraph applies first/offset/after.
+"""
+from itertools import product
+from typing import Optional
+
+PLAYER_FIELDS = """
+            uid
+            player_id
+            name
+            position
+            season_stats
+            plays_for @facets(since) {
+                uid
+                team_id
+                name
+            }"""
+
+GAME_FIELDS = """
+                uid
+                game_id
+                date
+                stage
+                team1 { uid team_id name }
+                team2 { uid team_id name }"""
+
+def _players_query(by_position: bool, by_team: bool, keyset: bool) -> str:
+    params = ["$limit: int"]
+    root_args = ["first: $limit"]
+    if keyset:
+        params.append("$after: string")
+        root_args.append("after: $after")
+    else:
+        params.append("$offset: int")
+        root_args.append("offset: $offset")
+
+    filters = []
+    if by_position:
+        params.append("$position: string")
+        filters.append("eq(position, $position)")
+    if by_team:
+        params.append("$team_id: string")
+        filters.append("uid_in(plays_for, $team_id)")
+    player_filter = " AND ".join(filters) if filters else "has(player_id)"
+
+    return f"""
+    query players({", ".join(params)}) {{
+        players(func: type(Player), {", ".join(root_args)}) @filter({player_filter}) {{{PLAYER_FIELDS}
+        }}
+    }}
+    """
+
+def _player_games_query(from_date: bool, to_date: bool) -> str:
+    params = ["$player_id: string"]
+    filters = []
+    if from_date:
+        params.append("$start_date: string")
+        filters.append("ge(date, $start_date)")
+    if to_date:
+        params.append("$end_date: string")
+        filters.append("le(date, $end_date)")
+    edge_filter = f" @filter({' AND '.join(filters)})" if filters else ""
+
+    return f"""
+    query player_games({", ".join(params)}) {{
+        player(func: eq(player_id, $player_id)) {{
+            participated_in (orderasc: date) @facets{edge_filter} {{{GAME_FIELDS}
+            }}
+        }}
+    }}
+    """
+
+# regexp at the root is served by the trigram index on name
+SEARCH_PLAYERS_QUERY = f"""
+    query search_players($name: string, $limit: int) {{
+        players(func: regexp(name, $name), first: $limit) @filter(type(Player)) {{{PLAYER_FIELDS}
+        }}
+    }}
+    """
+
+PLAYERS_QUERIES = {
+    flags: _players_query(*flags) for flags in product((False, True), repeat=3)
+}
+
+PLAYER_GAMES_QUERIES = {
+    flags: _player_games_query(*flags) for flags in product((False, True), repeat=2)
+}
+
+def players_query(position: Optional[str], team_id: Optional[str], skip: int, limit: int,
+                  after: Optional[str] = None):
+    """Return (query text, variables) for a players page"""
+    query = PLAYERS_QUERIES[(bool(position), bool(team_id), bool(after))]
+    # pydgraph requires every variable value to be a string
+    variables = {"$limit": str(limit)}
+    if after:
+        variables["$after"] = after
+    else:
+        variables["$offset"] = str(skip)
+    if position:
+        variables["$position"] = position
+    if team_id:
+        variables["$team_id"] = team_id
+    return query, variables
+
+def player_games_query(player_id: str, start_date=None, end_date=None):
+    """Return (query text, variables) for a player's games in a date range"""
+    query = PLAYER_GAMES_QUERIES[(start_date is not None, end_date is not None)]
+    variables = {"$player_id": player_id}
+    if start_date is not None:
+        variables["$start_date"] = start_date.isoformat()
+    if end_date is not None:
+        variables["$end_date"] = end_date.isoformat()
+    return query, variables
@@ -0,0 +1,113 @@
+import asyncio
+import re
+import unicodedata
+from typing import List, Optional
+from ..config import get_settings
+from .dgraph_service import dgraph_service
+
+settings = get_settings()
+
+ALL_PLAYERS_QUERY = """
+query all_players($first: int, $after: string) {
+    players(func: type(Player), first: $first, after: $after) {
+        uid
+        player_id
+        name
+        position
+    }
+}
+"""
+
+def normalize_name(name: str) -> str:
+    """Lowercase, strip accents and collapse whitespace ("Jokić" -> "jokic")"""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.lower().split())
+
+def regex_literal(text: str) -> str:
+    """Case-insensitive DQL regex that matches text literally"""
+    return "/" + re.escape(text).replace("/", "\\/") + "/i"
+
+class _TrieNode:
+    __slots__ = ("children", "matches")
+
+    def __init__(self):
+        self.children = {}
+        self.matches = []
+
+class PlayerNameIndex:
+    """
+    In-process prefix index over player names for autocomplete.
+
+    Every word of a name starts a path in the trie ("leb" and "jam" both
+    find LeBron James), and each node keeps its first max_matches players in
+    name order, so a lookup is one walk down the query's characters.
+    The trie is rebuilt from Dgraph and swapped in whole.
+    """
+    def __init__(self, max_matches: int = 10, max_depth: int = 32):
+        self.max_matches = max_matches
+        self.max_depth = max_depth
+        self._root = _TrieNode()
+        self.size = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def build(self, players: List[dict]):
+        root = _TrieNode()
+        entries = sorted(
+            (p for p in players if p.get("name")),
+            key=lambda p: normalize_name(p["name"])
+        )
+        for player in entries:
+            entry = {key: player.get(key) for key in ("uid", "player_id", "name", "position")}
+            name = normalize_name(player["name"])
+            starts = [0] + [m.end() for m in re.finditer(r"[\s\-'.]+", name)]
+            for start in starts:
+                node = root
+                for char in name[start:start + self.max_depth]:
+                    node = node.children.setdefault(char, _TrieNode())
+                    if len(node.matches) < self.max_matches and entry not in node.matches:
+                        node.matches.append(entry)
+        self._root = root
+        self.size = len(entries)
+
+    def search(self, prefix: str, limit: int = 10) -> List[dict]:
+        node = self._root
+        for char in normalize_name(prefix)[:self.max_depth]:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.matches[:limit]
+
+    async def refresh(self, page_size: int = 1000):
+        """Reload every player name from Dgraph and rebuild the trie"""
+        players = []
+        after = None
+        while True:
+            variables = {"$first": str(page_size), "$after": after or "0x0"}
+            result = await dgraph_service.execute_query(ALL_PLAYERS_QUERY, variables)
+            page = result.get("players", [])
+            players.extend(page)
+            if len(page) < page_size:
+                break
+            after = page[-1]["uid"]
+        self.build(players)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(settings.PLAYER_INDEX_REFRESH_SECONDS)
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Error refreshing player name index: {str(e)}")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+player_name_index = PlayerNameIndex()
@@ -0,0 +1,178 @@
+import time
+from datetime import date
+from typing import Dict, List, Optional
+import numpy as np
+from ..config import get_settings
+from .dgraph_service import dgraph_service, STAT_FIELDS
+
+settings = get_settings()
+
+PERCENTILES = (25, 50, 75, 90, 99)
+
+def season_bounds(season: int):
+    """NBA season starting in the given year: October 1 to June 30"""
+    return date(season, 10, 1), date(season + 1, 6, 30)
+
+def current_season(today: Optional[date] = None) -> int:
+    """Season in progress (or most recently finished) on the given day"""
+    today = today or date.today()
+    return today.year if today.month >= 10 else today.year - 1
+
+SEASON_STATS_QUERY = f"""
+query season_stats($start_date: string, $end_date: string) {{
+    players(func: type(Player)) @filter(has(participated_in)) {{
+        player_id
+        name
+        participated_in @facets({", ".join(STAT_FIELDS)}) @filter(ge(date, $start_date) AND le(date, $end_date)) {{
+            uid
+            game_id
+        }}
+    }}
+}}
+"""
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over the last `window` rows of each column (shorter at the start)"""
+    sums = np.cumsum(values, axis=0)
+    sums[window:] = sums[window:] - sums[:-window]
+    counts = np.minimum(np.arange(1, len(values) + 1), window)
+    return sums / counts[:, None]
+
+def ema(values: np.ndarray, span: int, tolerance: float = 1e-9) -> np.ndarray:
+    """
+    Exponential moving average of each column with alpha = 2 / (span + 1),
+    weights normalised over the rows seen so far. The kernel is cut off once
+    weights fall below `tolerance`, so each column is a single convolution.
+    """
+    decay = 1 - 2 / (span + 1)
+    length = min(len(values), int(np.ceil(np.log(tolerance) / np.log(decay))) + 1) if decay > 0 else 1
+    weights = decay ** np.arange(length)
+    norm = np.convolve(np.ones(len(values)), weights)[:len(values)]
+    smoothed = np.column_stack([
+        np.convolve(values[:, i], weights)[:len(values)] for i in range(values.shape[1])
+    ])
+    return smoothed / norm[:, None]
+
+def downsample(values: np.ndarray, points: int):
+    """
+    Average consecutive rows into at most `points` buckets.
+    Returns (bucket means, index of each bucket's last row).
+    """
+    if len(values) <= points:
+        return values, np.arange(len(values))
+    starts = np.linspace(0, len(values), points + 1).astype(int)[:-1]
+    sizes = np.diff(np.append(starts, len(values)))
+    return np.add.reduceat(values, starts, axis=0) / sizes[:, None], starts + sizes - 1
+
+class SeasonStats:
+    """
+    One season of per-game player stats as NumPy columns.
+
+    Row i is one player-game: player_index[i] points into player_ids/names,
+    game_ids[i] names the game and columns[stat][i] holds that game's value.
+    """
+    def __init__(self, season: int, player_ids: List[str], names: List[str],
+                 player_index: np.ndarray, game_ids: List[str], columns: Dict[str, np.ndarray]):
+        self.season = season
+        self.player_ids = player_ids
+        self.names = names
+        self.player_index = player_index
+        self.game_ids = game_ids
+        self.columns = columns
+        self.loaded_at = time.monotonic()
+
+    @classmethod
+    def from_dgraph(cls, season: int, players: List[dict]) -> "SeasonStats":
+        player_ids, names, game_ids = [], [], []
+        rows = sum(len(player.get("participated_in", [])) for player in players)
+        player_index = np.empty(rows, dtype=np.int32)
+        columns = {stat: np.zeros(rows, dtype=np.float64) for stat in STAT_FIELDS}
+
+        row = 0
+        for player in players:
+            games = player.get("participated_in", [])
+            if not games:
+                continue
+            index = len(player_ids)
+            player_ids.append(player["player_id"])
+            names.append(player.get("name"))
+            player_index[row:row + len(games)] = index
+            game_ids.extend(game.get("game_id") or game["uid"] for game in games)
+            for stat in STAT_FIELDS:
+                facet = f"participated_in|{stat}"
+                columns[stat][row:row + len(games)] = [game.get(facet, 0) for game in games]
+            row += len(games)
+
+        return cls(season, player_ids, names, player_index[:row], game_ids,
+                   {stat: column[:row] for stat, column in columns.items()})
+
+    def aggregate(self, min_games: int = 1) -> dict:
+        """
+        League-wide totals, per-game averages, per-36-minute rates and
+        percentiles of the per-game averages, in one vectorized pass.
+        """
+        n = len(self.player_ids)
+        games = np.bincount(self.player_index, minlength=n)
+        totals = {
+            stat: np.bincount(self.player_index, weights=column, minlength=n)
+            for stat, column in self.columns.items()
+        }
+        minutes = totals["minutes"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            per_game = {stat: np.where(games > 0, total / games, 0.0) for stat, total in totals.items()}
+            per_36 = {stat: np.where(minutes > 0, total / minutes * 36, 0.0) for stat, total in totals.items()}
+
+        qualified = games >= min_games
+        percentiles = {}
+        if qualified.any():
+            for stat, values in per_game.items():
+                cut = np.percentile(values[qualified], PERCENTILES)
+                percentiles[stat] = {f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, cut)}
+
+        players = [
+            {
+                "player_id": self.player_ids[i],
+                "name": self.names[i],
+                "games": int(games[i]),
+                "totals": {stat: float(totals[stat][i]) for stat in STAT_FIELDS},
+                "per_game": {stat: round(float(per_game[stat][i]), 2) for stat in STAT_FIELDS},
+                "per_36": {stat: round(float(per_36[stat][i]), 2) for stat in STAT_FIELDS}
+            }
+            for i in np.flatnonzero(qualified)
+        ]
+        return {
+            "season": self.season,
+            "players": players,
+            "percentiles": percentiles,
+            "min_games": min_games
+        }
+
+class PlayerStatsService:
+    def __init__(self):
+        self._seasons: Dict[int, SeasonStats] = {}
+
+    async def load_season(self, season: int, refresh: bool = False) -> SeasonStats:
+        """Load a season into column arrays, reusing a recent load"""
+        cached = self._seasons.get(season)
+        if cached and not refresh and time.monotonic() - cached.loaded_at < settings.PLAYER_STATS_TTL_SECONDS:
+            return cached
+
+        start_date, end_date = season_bounds(season)
+        result = await dgraph_service.execute_query(SEASON_STATS_QUERY, {
+            "$start_date": start_date.isoformat(),
+            "$end_date": end_date.isoformat()
+        })
+        stats = SeasonStats.from_dgraph(season, result.get("players", []))
+        self._seasons[season] = stats
+        return stats
+
+    def invalidate(self, season: Optional[int] = None):
+        if season is None:
+            self._seasons.clear()
+        else:
+            self._seasons.pop(season, None)
+
+    async def aggregate(self, season: int, min_games: int = 1) -> dict:
+        return (await self.load_season(season)).aggregate(min_games)
+
+player_stats_service = PlayerStatsService()
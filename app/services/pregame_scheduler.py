@@ -0,0 +1,264 @@
+import asyncio
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from pymongo.errors import DuplicateKeyError
+from ..config import get_settings
+from ..database.cassandra import cassandra_db
+from ..database.mongodb import mongodb
+from .fanout_service import notification_fanout
+from .serpapi_service import is_final, game_day
+
+settings = get_settings()
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel keyed by an id.
+
+    Level 0 has one slot per tick; each higher level's slot spans a full
+    turn of the level below. An entry sits in the coarsest level that still
+    separates it from now and cascades down as its slot comes up, so adding,
+    moving or cancelling an entry is O(1) and a tick only touches the
+    entries that are due.
+    """
+    def __init__(self, slots: int = 60, levels: int = 3, start_tick: int = 0):
+        self.slots = slots
+        self.levels = levels
+        self.now = start_tick
+        self._wheels = [[{} for _ in range(slots)] for _ in range(levels)]
+        self._where: Dict[str, Tuple[int, int]] = {}
+
+    @property
+    def horizon(self) -> int:
+        """Ticks ahead of now that the wheel can hold"""
+        return self.slots ** self.levels
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, key):
+        return key in self._where
+
+    def add(self, key: str, due_tick: int, item) -> List[Tuple[int, object]]:
+        """
+        Schedule item at due_tick, replacing any entry with the same key.
+        Entries already due are returned instead of stored.
+        """
+        self.cancel(key)
+        delay = due_tick - self.now
+        if delay <= 0:
+            return [(due_tick, item)]
+        if delay >= self.horizon:
+            raise ValueError(f"Due tick {due_tick} is beyond the wheel horizon")
+
+        level = 0
+        while delay >= self.slots ** (level + 1):
+            level += 1
+        slot = (due_tick // self.slots ** level) % self.slots
+        self._wheels[level][slot][key] = (due_tick, item)
+        self._where[key] = (level, slot)
+        return []
+
+    def cancel(self, key: str) -> bool:
+        where = self._where.pop(key, None)
+        if where is None:
+            return False
+        level, slot = where
+        del self._wheels[level][slot][key]
+        return True
+
+    def advance(self, to_tick: int) -> List[Tuple[int, object]]:
+        """Move the wheel to to_tick and return (due_tick, item) for everything due"""
+        fired = []
+        while self.now < to_tick:
+            self.now += 1
+            # Cascade coarse slots first so their entries land below before expiring
+            for level in range(self.levels - 1, 0, -1):
+                span = self.slots ** level
+                if self.now % span == 0:
+                    bucket = self._wheels[level][(self.now // span) % self.slots]
+                    entries = list(bucket.items())
+                    bucket.clear()
+                    for key, (due_tick, item) in entries:
+                        del self._where[key]
+                        fired.extend(self.add(key, due_tick, item))
+
+            bucket = self._wheels[0][self.now % self.slots]
+            for key, (due_tick, item) in bucket.items():
+                del self._where[key]
+                fired.append((due_tick, item))
+            bucket.clear()
+        return fired
+
+class PregameScheduler:
+    """
+    Sends "game starts soon" notifications, one trigger per game.
+
+    Upcoming games are read from the gamedetails date partitions and placed
+    on a one-second timing wheel at start_time minus the lead time. The
+    wheel is rebuilt from Cassandra at start and on every reload, so restarts
+    lose nothing; a claim document per game in MongoDB keeps a game from
+    being announced twice across restarts or instances. A failed send
+    releases its claim so the next reload can retry it. Triggers later than
+    PREGAME_MAX_LATENESS_SECONDS are dropped rather than sent late.
+
+    A reload never re-adds a game this process already handed off, one
+    whose trigger is past the lateness bound, or one already claimed, so the
+    counters only reflect real triggers.
+    """
+    def __init__(self, handler: Optional[Callable] = None, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.handler = handler or self.notify_followers
+        self.wheel = TimingWheel(start_tick=int(clock()))
+        self._tasks: List[asyncio.Task] = []
+        self._pending = set()
+        self._fired = set()  # ids handed off, within the current reload window
+        self.stats_counters = {
+            "fired": 0, "failed": 0, "dropped_late": 0, "duplicates": 0, "max_lateness_seconds": 0.0
+        }
+        self.last_reload = None
+
+    @property
+    def lead(self) -> timedelta:
+        return timedelta(minutes=settings.PREGAME_LEAD_MINUTES)
+
+    async def load_upcoming(self, today: Optional[date] = None) -> int:
+        """(Re)schedule every upcoming game with a known start time; returns how many are on the wheel"""
+        # Same schedule day that ingestion keys the gamedetails partitions on
+        today = today or game_day()
+        days = [today + timedelta(days=offset) for offset in range(settings.PREGAME_LOOKAHEAD_DAYS + 1)]
+        partitions = await asyncio.gather(*(
+            cassandra_db.execute_async("select_games_by_date", [day]) for day in days
+        ))
+
+        now = int(self.clock())
+        upcoming, overdue, seen = [], [], set()
+        for rows in partitions:
+            for row in rows:
+                game = row._asdict()
+                key = str(game["game_id"])
+                seen.add(key)
+                if not game.get("start_time") or is_final(game["stage"]) or key in self._fired:
+                    self.wheel.cancel(key)
+                    continue
+                due = int((game["start_time"] - self.lead - datetime(1970, 1, 1)).total_seconds())
+                if due - self.wheel.now >= self.wheel.horizon:
+                    # Picked up by a later reload
+                    continue
+                if due > now:
+                    upcoming.append((key, due, game))
+                elif now - due <= settings.PREGAME_MAX_LATENESS_SECONDS:
+                    # Missed while the process was down; still worth sending once
+                    overdue.append((key, due, game))
+                else:
+                    self.wheel.cancel(key)
+
+        if overdue:
+            claimed = await self._claimed([key for key, _, _ in overdue])
+            overdue = [entry for entry in overdue if entry[0] not in claimed]
+        for key, due, game in upcoming + overdue:
+            for due_tick, item in self.wheel.add(key, due, game):
+                self._fire(due_tick, item)
+
+        self._fired &= seen
+        self.last_reload = datetime.now()
+        return len(self.wheel)
+
+    @staticmethod
+    async def _claimed(game_ids: List[str]) -> set:
+        db = await mongodb.get_db()
+        cursor = db.pregame_notifications.find({"_id": {"$in": game_ids}}, {"_id": 1})
+        return {claim["_id"] async for claim in cursor}
+
+    def _fire(self, due_tick: int, game: dict):
+        lateness = self.clock() - due_tick
+        if lateness > settings.PREGAME_MAX_LATENESS_SECONDS:
+            self.stats_counters["dropped_late"] += 1
+            return
+        self.stats_counters["max_lateness_seconds"] = max(
+            self.stats_counters["max_lateness_seconds"], max(lateness, 0.0)
+        )
+        self._fired.add(str(game["game_id"]))
+        # Hand off without holding up the wheel
+        task = asyncio.create_task(self._deliver(game))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _deliver(self, game: dict):
+        key = str(game["game_id"])
+        claimed = False
+        try:
+            if not await self._claim(game):
+                self.stats_counters["duplicates"] += 1
+                return
+            claimed = True
+            await self.handler(game)
+            self.stats_counters["fired"] += 1
+        except Exception as e:
+            print(f"Error sending pre-game notifications for {key}: {str(e)}")
+            self.stats_counters["failed"] += 1
+            # Let a reload within the lateness bound try again
+            self._fired.discard(key)
+            if claimed:
+                await self._release(key)
+
+    @staticmethod
+    async def _claim(game: dict) -> bool:
+        db = await mongodb.get_db()
+        try:
+            await db.pregame_notifications.insert_one(
+                {"_id": str(game["game_id"]), "date": datetime.utcnow()}
+            )
+        except DuplicateKeyError:
+            return False
+        return True
+
+    @staticmethod
+    async def _release(game_id: str):
+        try:
+            db = await mongodb.get_db()
+            await db.pregame_notifications.delete_one({"_id": game_id})
+        except Exception as e:
+            print(f"Error releasing pre-game claim for {game_id}: {str(e)}")
+
+    @staticmethod
+    async def notify_followers(game: dict):
+        message = (
+            f"{game['team1_name']} vs {game['team2_name']} starts in "
+            f"{settings.PREGAME_LEAD_MINUTES} minutes"
+        )
+        return await notification_fanout.notify_game_followers(game, message)
+
+    async def _tick(self):
+        while True:
+            now = self.clock()
+            await asyncio.sleep(int(now) + 1 - now)
+            for due_tick, game in self.wheel.advance(int(self.clock())):
+                self._fire(due_tick, game)
+
+    async def _reload(self):
+        while True:
+            await asyncio.sleep(settings.PREGAME_RELOAD_INTERVAL)
+            try:
+                await self.load_upcoming()
+            except Exception as e:
+                print(f"Error reloading pre-game schedule: {str(e)}")
+
+    def start(self):
+        if self._tasks:
+            return
+        # Catch the wheel up to now before resuming normal ticks
+        for due_tick, game in self.wheel.advance(int(self.clock())):
+            self._fire(due_tick, game)
+        self._tasks = [asyncio.create_task(self._tick()), asyncio.create_task(self._reload())]
+
+    async def stop(self):
+        for task in self._tasks + list(self._pending):
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._pending, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> dict:
+        return {**self.stats_counters, "scheduled": len(self.wheel), "last_reload": self.last_reload}
+
+pregame_scheduler = PregameScheduler()
@@ -0,0 +1,74 @@
+import asyncio
+from typing import Optional
+import aiohttp
+from ..config import get_settings
+
+settings = get_settings()
+
+class SerpAPIClient:
+    """
+    Non-blocking SerpAPI client.
+
+    One aiohttp session (and connection pool) is shared by the whole process.
+    Identical requests that are in flight at the same time are coalesced, so
+    every concurrent caller awaits the same upstream call and gets its result.
+    """
+    def __init__(self):
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._in_flight = {}
+        self.upstream_calls = 0
+        self.coalesced_calls = 0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=settings.SERPAPI_POOL_SIZE,
+                keepalive_timeout=settings.SERPAPI_KEEPALIVE_SECONDS,
+                ttl_dns_cache=300
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=settings.SERPAPI_TIMEOUT_SECONDS)
+            )
+        return self.session
+
+    async def get_dict(self, params: dict, timeout: Optional[float] = None) -> dict:
+        """
+        Run a SerpAPI search and return the decoded JSON response
+        Args:
+            params: SerpAPI query parameters (including api_key)
+            timeout: Optional per-call timeout in seconds
+        """
+        key = tuple(sorted((k, str(v)) for k, v in params.items()))
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._request(params, timeout))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced_calls += 1
+        # Shield so a cancelled waiter doesn't cancel the call for everyone else
+        return await asyncio.shield(task)
+
+    async def _request(self, params: dict, timeout: Optional[float]) -> dict:
+        self.upstream_calls += 1
+        query = {**params, "output": "json"}
+        request_timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
+        async with self._get_session().get(
+            settings.SERPAPI_BASE_URL, params=query, timeout=request_timeout
+        ) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    def stats(self) -> dict:
+        return {
+            "upstream_calls": self.upstream_calls,
+            "coalesced_calls": self.coalesced_calls,
+            "in_flight": len(self._in_flight)
+        }
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+
+serpapi_client = SerpAPIClient()
@@ -1,13 +1,94 @@
 import os
-from serpapi import GoogleSearch
-from datetime import datetime, date
+import re
+import asyncio
+import time
+from datetime import datetime, date, timedelta, timezone
+from zoneinfo import ZoneInfo
+from cassandra.query import UNSET_VALUE
 from ..database.cassandra import cassandra_db
-import uuid
-from bson import ObjectId
+from .serpapi_client import serpapi_client
+from .identity_registry import identity_registry
+from ..config import get_settings
+
+settings = get_settings()
+
+def is_final(stage: str) -> bool:
+    return bool(stage) and stage.lower().startswith("final")
+
+# Tip-off time as SerpAPI shows it for scheduled games, e.g. "7:30 PM"
+START_TIME_PATTERN = re.compile(r"\b(\d{1,2}):(\d{2})\s*([ap])\.?m\b", re.IGNORECASE)
+
+# Game dates as SerpAPI shows them, e.g. "Today, 7:30 PM", "Sat, Jan 13", "Jan 13"
+RELATIVE_DAYS = {"yesterday": -1, "today": 0, "tonight": 0, "tomorrow": 1}
+MONTH_DAY_PATTERN = re.compile(r"\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+(\d{1,2})\b", re.IGNORECASE)
+MONTHS = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+
+def game_day(now: datetime = None) -> date:
+    """
+    The schedule day in progress: today in GAME_TIMEZONE, except that the
+    small hours still count as the previous day, so a game running past
+    midnight keeps the date (and game id) it started with
+    """
+    local = (now or datetime.now(timezone.utc)).astimezone(ZoneInfo(settings.GAME_TIMEZONE))
+    return (local - timedelta(hours=settings.GAME_DAY_ROLLOVER_HOUR)).date()
+
+def parse_game_date(text: str, today: date) -> date:
+    """Date of a game from SerpAPI's date text, relative to today; None if it has none"""
+    text = (text or "").lower()
+    for word, offset in RELATIVE_DAYS.items():
+        if word in text:
+            return today + timedelta(days=offset)
+    match = MONTH_DAY_PATTERN.search(text)
+    if not match:
+        return None
+    month, day = MONTHS.index(match.group(1)[:3].lower()) + 1, int(match.group(2))
+    # No year is shown; take the one that puts the game closest to today
+    candidates = []
+    for year in (today.year - 1, today.year, today.year + 1):
+        try:
+            candidates.append(date(year, month, day))
+        except ValueError:
+            continue
+    return min(candidates, key=lambda d: abs(d - today)) if candidates else None
+
+def parse_start_time(game_date: date, *texts) -> datetime:
+    """
+    Tip-off as a naive UTC datetime from the first text holding a clock time,
+    read in GAME_TIMEZONE; None when no text has one
+    """
+    for text in texts:
+        match = START_TIME_PATTERN.search(text or "")
+        if match:
+            hour, minute, meridiem = int(match.group(1)) % 12, int(match.group(2)), match.group(3).lower()
+            if meridiem == "p":
+                hour += 12
+            local = datetime(game_date.year, game_date.month, game_date.day, hour, minute,
+                             tzinfo=ZoneInfo(settings.GAME_TIMEZONE))
+            return local.astimezone(timezone.utc).replace(tzinfo=None)
+    return None
+
+class SerpAPIError(RuntimeError):
+    """SerpAPI answered without the results we asked for"""
+
+def sports_results(results: dict, section: str) -> list:
+    """The requested sports_results section, raising on error payloads"""
+    if results.get("error"):
+        raise SerpAPIError(results["error"])
+    if section not in results.get("sports_results", {}):
+        raise SerpAPIError(f"No sports_results.{section} in SerpAPI response")
+    return results["sports_results"][section]
+
+def ordered_pair(team1_id, team2_id):
+    """Order two team ids the way head_to_head partitions are keyed"""
+    if str(team1_id) <= str(team2_id):
+        return team1_id, team2_id, False
+    return team2_id, team1_id, True
 
 class SerpAPIService:
     def __init__(self):
         self.api_key = os.getenv('SERPAPI_API_KEY')
+        # Final games already counted in head_to_head_totals by this process
+        self._head_to_head_recorded = set()
 
     async def fetch_games(self, date_param=None, store_in_db=True):
         """
@@ -26,67 +107,67 @@ class SerpAPIService:
         if date_param:
             params["q"] = f"NBA games on {date_param}"
 
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        return await self._load_games(params, date_param, store_in_db)
 
-        if "sports_results" not in results:
-            return []
+    async def _load_games(self, params, date_param, store_in_db):
+        results = await serpapi_client.get_dict(params)
+
+        requested_date = (
+            date_param if isinstance(date_param, date)
+            else datetime.strptime(date_param, '%Y-%m-%d').date() if date_param
+            else None
+        )
+        # SerpAPI's "Today"/"Yesterday" follow the calendar; the fallback
+        # follows the schedule day
+        calendar_today = datetime.now(ZoneInfo(settings.GAME_TIMEZONE)).date()
+        today = game_day()
 
         games = []
-        for game in results.get("sports_results", {}).get("games", []):
-            # Convert string date to date object if provided, otherwise use today
+        for game in sports_results(results, "games"):
+            # The game id is keyed on this date, so it must not depend on when
+            # the scoreboard happens to be polled
             game_date = (
-                date_param if isinstance(date_param, date)
-                else datetime.strptime(date_param, '%Y-%m-%d').date() if date_param
-                else datetime.now().date()
+                requested_date
+                or parse_game_date(game.get("date"), calendar_today)
+                or today
             )
 
+            team1_id = identity_registry.team_id(game["teams"][0]["name"])
+            team2_id = identity_registry.team_id(game["teams"][1]["name"])
+
             game_data = {
-                "game_id": uuid.uuid4(),
+                "game_id": identity_registry.game_id(game_date, team1_id, team2_id),
                 "date": game_date,
                 "stage": game.get("stage", "SCHEDULED"),
-                "team1_id": uuid.uuid4(),
+                "team1_id": team1_id,
                 "team1_name": game["teams"][0]["name"],
                 "team1_score": int(game["teams"][0].get("score", 0)),
-                "team2_id": uuid.uuid4(),
+                "team2_id": team2_id,
                 "team2_name": game["teams"][1]["name"],
                 "team2_score": int(game["teams"][1].get("score", 0)),
-                "highlight_video_link": game.get("video_highlights", {}).get("link") or ""
+                "highlight_video_link": game.get("video_highlights", {}).get("link") or "",
+                "start_time": parse_start_time(game_date, game.get("time"), game.get("date"), game.get("stage"))
             }
             games.append(game_data)
-            
-            if store_in_db:
-                try:
-                    self.store_game(game_data)
-                except Exception as e:
-                    print(f"Warning: Failed to store game in Cassandra: {str(e)}")
-                    print(f"Game data: {game_data}")
 
-        return games
-
-    def store_game(self, game_data):
-        """Store game data in Cassandra database"""
-        if not hasattr(cassandra_db, 'session') or not cassandra_db.session:
-            raise RuntimeError("Cassandra session not initialized")
+        if store_in_db and games:
+            try:
+                # execute_concurrent blocks until the whole batch is written
+                result = await asyncio.get_running_loop().run_in_executor(
+                    None, self.store_games, games
+                )
+                for failure in result["failures"]:
+                    print(f"Warning: Failed to store game in Cassandra: {failure}")
+            except Exception as e:
+                print(f"Warning: Failed to store games in Cassandra: {str(e)}")
 
-        # Prepare statements for better performance and safety
-        gamedetails_stmt = cassandra_db.session.prepare("""
-            INSERT INTO gamedetails (
-                date, game_id, stage, team1_id, team1_name, team1_score,
-                team2_id, team2_name, team2_score, highlight_video_link
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """)
-        
-        teamgames_stmt = cassandra_db.session.prepare("""
-            INSERT INTO teamgames (
-                team_id, date, game_id, opponent_team_id, opponent_team_name,
-                team_score, opponent_score, highlight_video_link
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """)
+        return games
 
-        try:
-            # Execute gamedetails insert
-            cassandra_db.session.execute(gamedetails_stmt, [
+    @staticmethod
+    def _game_writes(game_data):
+        """The gamedetails and games_by_id rows and both teamgames rows for one game"""
+        return [
+            ("insert_gamedetails", [
                 game_data["date"],
                 game_data["game_id"],
                 game_data["stage"],
@@ -96,11 +177,24 @@ class SerpAPIService:
                 game_data["team2_id"],
                 game_data["team2_name"],
                 game_data["team2_score"],
+                game_data["highlight_video_link"],
+                # Left untouched once the stage no longer shows the tip-off time
+                game_data.get("start_time") or UNSET_VALUE
+            ]),
+            ("insert_game_by_id", [
+                game_data["game_id"],
+                game_data["date"],
+                game_data["stage"],
+                game_data["team1_id"],
+                game_data["team1_name"],
+                game_data["team1_score"],
+                game_data["team2_id"],
+                game_data["team2_name"],
+                game_data["team2_score"],
                 game_data["highlight_video_link"]
-            ])
-
-            # Execute teamgames insert for team1
-            cassandra_db.session.execute(teamgames_stmt, [
+            ]),
+            # teamgames row for team1
+            ("insert_teamgames", [
                 game_data["team1_id"],
                 game_data["date"],
                 game_data["game_id"],
@@ -109,10 +203,9 @@ class SerpAPIService:
                 game_data["team1_score"],
                 game_data["team2_score"],
                 game_data["highlight_video_link"]
-            ])
-
-            # Execute teamgames insert for team2
-            cassandra_db.session.execute(teamgames_stmt, [
+            ]),
+            # teamgames row for team2
+            ("insert_teamgames", [
                 game_data["team2_id"],
                 game_data["date"],
                 game_data["game_id"],
@@ -122,10 +215,135 @@ class SerpAPIService:
                 game_data["team1_score"],
                 game_data["highlight_video_link"]
             ])
-            
-        except Exception as e:
-            print(f"Error details for game {game_data['game_id']}: {str(e)}")
-            raise
+        ]
+
+    @staticmethod
+    def _head_to_head_row(game_data):
+        team_a, team_b, swapped = ordered_pair(game_data["team1_id"], game_data["team2_id"])
+        score_a, score_b = game_data["team1_score"], game_data["team2_score"]
+        if swapped:
+            score_a, score_b = score_b, score_a
+        return team_a, team_b, score_a, score_b
+
+    def _record_head_to_head(self, games, concurrency, errors_by_game):
+        """
+        Add completed games to head_to_head and bump head_to_head_totals.
+
+        The row is inserted with a lightweight transaction as pending
+        (totals_applied = false). Counters are bumped for a new row, or for an
+        existing row that is still pending because an earlier counter update
+        failed, and the row is marked applied only after the counters succeed.
+        Re-ingesting a game therefore never counts it twice and retries a
+        game whose totals were not yet applied.
+        """
+        pending = [
+            game_data for game_data in games
+            if is_final(game_data["stage"])
+            and game_data["game_id"] not in self._head_to_head_recorded
+            and game_data["game_id"] not in errors_by_game
+        ]
+        if not pending:
+            return
+
+        inserts = []
+        for game_data in pending:
+            team_a, team_b, score_a, score_b = self._head_to_head_row(game_data)
+            inserts.append(("insert_head_to_head", [
+                team_a, team_b, game_data["date"], game_data["game_id"],
+                score_a, score_b, game_data["highlight_video_link"]
+            ]))
+
+        to_count = []
+        for game_data, (success, outcome) in zip(
+            pending, cassandra_db.execute_many(inserts, concurrency)
+        ):
+            if not success:
+                errors_by_game.setdefault(game_data["game_id"], []).append(str(outcome))
+            elif outcome.was_applied or getattr(outcome.one(), "totals_applied", None) is False:
+                to_count.append(game_data)
+            else:
+                # Counted by an earlier ingest
+                self._head_to_head_recorded.add(game_data["game_id"])
+
+        updates = []
+        for game_data in to_count:
+            team_a, team_b, score_a, score_b = self._head_to_head_row(game_data)
+            updates.append(("update_head_to_head_totals", [
+                int(score_a > score_b), int(score_b > score_a),
+                score_a, score_b, team_a, team_b
+            ]))
+
+        marks = []
+        counted = []
+        for game_data, (success, outcome) in zip(
+            to_count, cassandra_db.execute_many(updates, concurrency)
+        ):
+            if not success:
+                # Left pending; the next ingest of this game retries the counters
+                errors_by_game.setdefault(game_data["game_id"], []).append(str(outcome))
+                continue
+            team_a, team_b, _, _ = self._head_to_head_row(game_data)
+            marks.append(("mark_head_to_head_totals_applied", [
+                team_a, team_b, game_data["date"], game_data["game_id"]
+            ]))
+            counted.append(game_data["game_id"])
+
+        for game_id, (success, outcome) in zip(
+            counted, cassandra_db.execute_many(marks, concurrency)
+        ):
+            # Counters are in; don't count the game again from this process
+            self._head_to_head_recorded.add(game_id)
+            if not success:
+                errors_by_game.setdefault(game_id, []).append(str(outcome))
+
+    def store_game(self, game_data):
+        """Store game data in Cassandra database"""
+        result = self.store_games([game_data])
+        if result["failures"]:
+            print(f"Error details for game {game_data['game_id']}: {result['failures'][0]['errors']}")
+            raise RuntimeError(result["failures"][0]["errors"][0])
+
+    def store_games(self, games, concurrency=None) -> dict:
+        """
+        Store many games in Cassandra with a bounded number of writes in flight.
+        A failed row is reported in the result and doesn't abort the rest.
+        Args:
+            games: Iterable of game dicts as produced by fetch_games
+            concurrency: Max in-flight writes (default: CASSANDRA_WRITE_CONCURRENCY)
+        """
+        if not hasattr(cassandra_db, 'session') or not cassandra_db.session:
+            raise RuntimeError("Cassandra session not initialized")
+
+        games = list(games)
+        writes = []
+        owners = []
+        for game_data in games:
+            for write in self._game_writes(game_data):
+                writes.append(write)
+                owners.append(game_data["game_id"])
+
+        started = time.perf_counter()
+        results = cassandra_db.execute_many(writes, concurrency)
+
+        errors_by_game = {}
+        for game_id, (success, outcome) in zip(owners, results):
+            if not success:
+                errors_by_game.setdefault(game_id, []).append(str(outcome))
+
+        self._record_head_to_head(games, concurrency, errors_by_game)
+        elapsed = time.perf_counter() - started
+
+        return {
+            "games": len(games),
+            "rows": len(writes),
+            "rows_failed": sum(len(errors) for errors in errors_by_game.values()),
+            "failures": [
+                {"game_id": str(game_id), "errors": errors}
+                for game_id, errors in errors_by_game.items()
+            ],
+            "elapsed_seconds": elapsed,
+            "rows_per_second": len(writes) / elapsed if elapsed > 0 else 0.0
+        }
 
     async def fetch_teams(self, conference=None):
         """
@@ -144,72 +362,65 @@ class SerpAPIService:
         }
 
         try:
-            search = GoogleSearch(params)
-            results = search.get_dict()
-            
-            print("Debugging sports_results:", results.get("sports_results", {}))
+            return await self._load_teams(params, conference)
+        except Exception as e:
+            print(f"Error in fetch_teams: {str(e)}")
+            print(f"Full error: {str(e.__class__.__name__)}: {str(e)}")
+            return []
+
+    async def _load_teams(self, params, conference):
+        results = await serpapi_client.get_dict(params)
+        
+        standings = sports_results(results, "standings")
+        if not standings:
+            print("No standings data found")
+            return []
+
+        teams = []
+        conference_map = {
+            "eastern": "EASTERN",
+            "western": "WESTERN",
+            "east": "EASTERN",
+            "west": "WESTERN"
+        }
+
+        for conf_standings in standings:
+            # Get conference name from the standings section title
+            conf_title = conf_standings.get("name", "").lower()
+            conf_name = next((k for k in conference_map.keys() 
+                            if k in conf_title), None)
             
-            if "sports_results" not in results:
-                print("No sports results found in SerpAPI response")
-                return []
-
-            # Get the standings data directly from sports_results
-            standings = results.get("sports_results", {}).get("standings", [])
-            if not standings:
-                print("No standings data found")
-                return []
-
-            teams = []
-            conference_map = {
-                "eastern": "EASTERN",
-                "western": "WESTERN",
-                "east": "EASTERN",
-                "west": "WESTERN"
-            }
+            if not conf_name:
+                print(f"Unknown conference name in title: {conf_title}")
+                continue
 
-            for conf_standings in standings:
-                # Get conference name from the standings section title
-                conf_title = conf_standings.get("name", "").lower()
-                conf_name = next((k for k in conference_map.keys() 
-                                if k in conf_title), None)
-                
-                if not conf_name:
-                    print(f"Unknown conference name in title: {conf_title}")
-                    continue
+            normalized_conf = conference_map[conf_name]
+            if conference and normalized_conf.lower() != conference.lower():
+                continue
 
-                normalized_conf = conference_map[conf_name]
-                if conference and normalized_conf.lower() != conference.lower():
+            # Process teams in this conference
+            for team in conf_standings.get("teams", []):
+                try:
+                    team_data = {
+                        "team_name": team.get("name", ""),
+                        "conference": normalized_conf,
+                        "position": int(team.get("position", 0)),
+                        "wins": int(team.get("wins", 0)),
+                        "losses": int(team.get("losses", 0)),
+                        "games_behind": float(team.get("games_behind", "0").replace("-", "0")),
+                        "conf_record": team.get("conference_record", "0-0"),
+                        "home_record": team.get("home_record", "0-0"),
+                        "away_record": team.get("away_record", "0-0"),
+                        "last_10": team.get("last_10", "0-0"),
+                        "streak": team.get("streak", "")
+                    }
+                    teams.append(team_data)
+                except (KeyError, ValueError) as e:
+                    print(f"Error processing team data: {e}")
+                    print(f"Raw team data: {team}")
                     continue
 
-                # Process teams in this conference
-                for team in conf_standings.get("teams", []):
-                    try:
-                        team_data = {
-                            "team_name": team.get("name", ""),
-                            "conference": normalized_conf,
-                            "position": int(team.get("position", 0)),
-                            "wins": int(team.get("wins", 0)),
-                            "losses": int(team.get("losses", 0)),
-                            "games_behind": float(team.get("games_behind", "0").replace("-", "0")),
-                            "conf_record": team.get("conference_record", "0-0"),
-                            "home_record": team.get("home_record", "0-0"),
-                            "away_record": team.get("away_record", "0-0"),
-                            "last_10": team.get("last_10", "0-0"),
-                            "streak": team.get("streak", "")
-                        }
-                        teams.append(team_data)
-                        print(f"Processed team: {team_data['team_name']} ({team_data['conference']})")
-                    except (KeyError, ValueError) as e:
-                        print(f"Error processing team data: {e}")
-                        print(f"Raw team data: {team}")
-                        continue
-
-            print(f"Found {len(teams)} teams from SerpAPI")
-            return teams
-
-        except Exception as e:
-            print(f"Error in fetch_teams: {str(e)}")
-            print(f"Full error: {str(e.__class__.__name__)}: {str(e)}")
-            return []
+        print(f"Found {len(teams)} teams from SerpAPI")
+        return teams
 
 serpapi_service = SerpAPIService() 
\ No newline at end of file
@@ -0,0 +1,146 @@
+import hashlib
+from bisect import bisect_right
+import json
+import orjson
+from datetime import datetime
+from types import MappingProxyType
+from typing import List, Optional, Tuple
+from pymongo import UpdateOne
+from ..database.mongodb import mongodb
+from ..schemas.encoders import encode_team_doc
+from .identity_registry import identity_registry
+
+CONFERENCES = ("EASTERN", "WESTERN")
+
+class StandingsSnapshot:
+    """
+    Immutable, pre-sorted and pre-serialized view of the standings.
+
+    Rows are validated and encoded to JSON once when the snapshot is built,
+    so reads (including pagination slices) only join bytes. A refresh builds
+    a new snapshot and swaps the reference; readers never see a partial one.
+    """
+    __slots__ = ("version", "created_at", "digest", "_views", "_keys", "_rows_json", "_json")
+
+    def __init__(self, teams: List[dict], version: int):
+        self.version = version
+        self.created_at = datetime.utcnow()
+        ordered = sorted(teams, key=self.sort_key)
+        keys = [self.sort_key(team) for team in ordered]
+        encoded = [orjson.dumps(team) for team in ordered]
+        frozen = [MappingProxyType(dict(team)) for team in ordered]
+
+        self._views = {"ALL": tuple(frozen)}
+        self._keys = {"ALL": tuple(keys)}
+        self._rows_json = {"ALL": tuple(encoded)}
+        for conference in CONFERENCES:
+            indexes = [i for i, team in enumerate(ordered) if team["conference"] == conference]
+            self._views[conference] = tuple(frozen[i] for i in indexes)
+            self._keys[conference] = tuple(keys[i] for i in indexes)
+            self._rows_json[conference] = tuple(encoded[i] for i in indexes)
+        self._json = {
+            view: b"[" + b",".join(rows) + b"]"
+            for view, rows in self._rows_json.items()
+        }
+        # Content digest, identical across processes holding the same standings
+        self.digest = hashlib.blake2b(self._json["ALL"], digest_size=16).hexdigest()
+
+    @staticmethod
+    def sort_key(team) -> tuple:
+        """Total order of the standings: (conference, position, id)"""
+        return (team["conference"], team["position"], team["id"])
+
+    def teams(self, conference: Optional[str] = None) -> Tuple[MappingProxyType, ...]:
+        return self._views.get(conference or "ALL", ())
+
+    def json(self, conference: Optional[str] = None, skip: int = 0, limit: Optional[int] = None) -> bytes:
+        view = conference or "ALL"
+        if skip == 0 and limit is None:
+            return self._json.get(view, b"[]")
+        rows = self._rows_json.get(view, ())
+        end = None if limit is None else skip + limit
+        return b"[" + b",".join(rows[skip:end]) + b"]"
+
+    def page(self, conference: Optional[str], limit: int, skip: int = 0,
+             after: Optional[tuple] = None) -> Tuple[bytes, Optional[tuple]]:
+        """
+        One page of rows, starting after the given sort key (keyset) or at skip.
+        Returns the JSON bytes and the sort key of the last row if more follow.
+        """
+        view = conference or "ALL"
+        keys = self._keys.get(view, ())
+        start = bisect_right(keys, tuple(after)) if after is not None else skip
+        end = start + limit
+        rows = self._rows_json.get(view, ())[start:end]
+        next_key = keys[end - 1] if end < len(keys) else None
+        return b"[" + b",".join(rows) + b"]", next_key
+
+class StandingsService:
+    def __init__(self):
+        # team_name -> content_hash of the last version written to MongoDB
+        self._hashes = None
+        self.snapshot: Optional[StandingsSnapshot] = None
+        self._version = 0
+
+    async def refresh_snapshot(self) -> StandingsSnapshot:
+        """Rebuild the standings snapshot from MongoDB and swap it in"""
+        db = await mongodb.get_db()
+        teams = await db.teams.find({}).to_list(length=100)
+        rows = [encode_team_doc(team) for team in teams]
+        self._version += 1
+        self.snapshot = StandingsSnapshot(rows, self._version)
+        return self.snapshot
+
+    @staticmethod
+    def content_hash(team: dict) -> str:
+        payload = json.dumps(team, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    async def _load_hashes(self, db):
+        cursor = db.teams.find({}, {"team_name": 1, "content_hash": 1})
+        self._hashes = {
+            team["team_name"]: team.get("content_hash")
+            async for team in cursor
+        }
+
+    async def store_teams(self, teams: List[dict]) -> int:
+        """
+        Upsert changed standings rows into the MongoDB teams collection with a
+        single unordered bulk write. Teams whose content hash matches the last
+        write are skipped. Returns the number of teams written.
+        """
+        db = await mongodb.get_db()
+        if self._hashes is None:
+            await self._load_hashes(db)
+
+        operations = []
+        hashes = {}
+        for team in teams:
+            # Remove id before storing to let MongoDB generate it
+            store_team = team.copy()
+            if 'id' in store_team:
+                del store_team['id']
+            store_team["team_uuid"] = str(identity_registry.team_id(team["team_name"]))
+
+            team_hash = self.content_hash(store_team)
+            if self._hashes.get(team["team_name"]) == team_hash:
+                continue
+            store_team["content_hash"] = team_hash
+            hashes[team["team_name"]] = team_hash
+            operations.append(UpdateOne(
+                {"team_name": team["team_name"]},
+                {"$set": store_team},
+                upsert=True
+            ))
+
+        if not operations:
+            if self.snapshot is None:
+                await self.refresh_snapshot()
+            return 0
+
+        await db.teams.bulk_write(operations, ordered=False)
+        self._hashes.update(hashes)
+        await self.refresh_snapshot()
+        return len(operations)
+
+standings_service = StandingsService()
@@ -0,0 +1,54 @@
+"""
+One-shot backfill of the games_by_id lookup table from gamedetails.
+
+Run from the repository root:
+    python -m scripts.backfill_games_by_id
+
+Safe to re-run: rows are plain upserts keyed by game_id.
+"""
+from app.database.cassandra import cassandra_db
+
+BATCH_SIZE = 500
+
+def _flush(batch):
+    failed = 0
+    for success, outcome in cassandra_db.execute_many(batch):
+        if not success:
+            failed += 1
+            print(f"Failed to copy row: {outcome}")
+    return failed
+
+def backfill_games_by_id():
+    copied = 0
+    failed = 0
+    batch = []
+    # Iterating the result set pages through gamedetails transparently
+    for row in cassandra_db.execute("select_all_gamedetails"):
+        batch.append(("insert_game_by_id", [
+            row.game_id,
+            row.date,
+            row.stage,
+            row.team1_id,
+            row.team1_name,
+            row.team1_score,
+            row.team2_id,
+            row.team2_name,
+            row.team2_score,
+            row.highlight_video_link
+        ]))
+        if len(batch) >= BATCH_SIZE:
+            failed += _flush(batch)
+            copied += len(batch)
+            batch = []
+    if batch:
+        failed += _flush(batch)
+        copied += len(batch)
+
+    print(f"Backfilled {copied - failed} games into games_by_id ({failed} failed)")
+
+if __name__ == "__main__":
+    cassandra_db.connect()
+    try:
+        backfill_games_by_id()
+    finally:
+        cassandra_db.close()
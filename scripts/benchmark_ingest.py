@@ -0,0 +1,82 @@
+"""
+Compare Cassandra ingestion throughput of the serial per-game loop against
+the concurrent bulk path.
+
+Run from the repository root:
+    python -m scripts.benchmark_ingest --games 2000 --concurrency 64
+
+Rows are written to a scratch keyspace (--keyspace) that is created for the
+run and dropped afterwards; the configured CASSANDRA_KEYSPACE is never used.
+"""
+import argparse
+import re
+import time
+import uuid
+from datetime import date
+from app.config import get_settings
+from app.database.cassandra import cassandra_db
+from app.services.serpapi_service import serpapi_service
+
+BENCH_DATE = date(2000, 1, 1)
+
+def make_games(count):
+    return [
+        {
+            "game_id": uuid.uuid4(),
+            "date": BENCH_DATE,
+            # Not final: keeps head-to-head LWTs and counters out of the bulk run
+            "stage": "Scheduled",
+            "team1_id": uuid.uuid4(),
+            "team1_name": f"Bench Home {i}",
+            "team1_score": 100 + i % 30,
+            "team2_id": uuid.uuid4(),
+            "team2_name": f"Bench Away {i}",
+            "team2_score": 95 + i % 25,
+            "highlight_video_link": ""
+        }
+        for i in range(count)
+    ]
+
+def run_serial(games):
+    # One synchronous round trip per row, as the per-game loop used to do
+    started = time.perf_counter()
+    rows = 0
+    for game in games:
+        for name, params in serpapi_service._game_writes(game):
+            cassandra_db.execute(name, params)
+            rows += 1
+    elapsed = time.perf_counter() - started
+    return rows / elapsed
+
+def run_bulk(games, concurrency):
+    result = serpapi_service.store_games(games, concurrency=concurrency)
+    if result["rows_failed"]:
+        print(f"Bulk run had {result['rows_failed']} failed rows")
+    return result["rows_per_second"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--keyspace", default="sports_analytics_bench",
+                        help="Scratch keyspace, dropped when the run ends")
+    args = parser.parse_args()
+
+    if not re.fullmatch(r"[a-zA-Z][a-zA-Z0-9_]{0,47}", args.keyspace):
+        parser.error("--keyspace must be a plain CQL identifier")
+    if args.keyspace == get_settings().CASSANDRA_KEYSPACE:
+        parser.error("--keyspace must not be the application keyspace")
+
+    cassandra_db.connect(keyspace=args.keyspace)
+    try:
+        serial = run_serial(make_games(args.games))
+        bulk = run_bulk(make_games(args.games), args.concurrency)
+        print(f"Serial loop:  {serial:10.1f} rows/sec")
+        print(f"Bulk ingest:  {bulk:10.1f} rows/sec (concurrency={args.concurrency})")
+        print(f"Speedup:      {bulk / serial:10.1f}x")
+    finally:
+        cassandra_db.session.execute(f"DROP KEYSPACE IF EXISTS {args.keyspace}")
+        cassandra_db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Per-row cost of the default response path versus the trusted-row fast path.
+
+Default: build one Pydantic model per row, then let FastAPI validate the list
+against response_model and encode it with jsonable_encoder + json.
+Fast: encode rows to plain dicts and render them with orjson.
+
+Run from the repository root:
+    python -m scripts.benchmark_serialization
+"""
+import asyncio
+import time
+import uuid
+from collections import namedtuple
+from datetime import date
+from cassandra.util import Date
+from typing import List
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.responses import FastJSONResponse
+from app.schemas.encoders import encode_game_row, encode_team_doc
+from app.schemas.game import GameResponse
+from app.schemas.team import TeamResponse
+
+GameRow = namedtuple("GameRow", [
+    "date", "game_id", "stage", "team1_id", "team1_name", "team1_score",
+    "team2_id", "team2_name", "team2_score", "highlight_video_link"
+])
+
+def make_game_rows(count):
+    # Dates as the driver returns them, so both paths pay for the conversion
+    return [
+        GameRow(Date(date(2024, 1, 1)), uuid.uuid4(), "Final", uuid.uuid4(), f"Home {i}",
+                100 + i % 30, uuid.uuid4(), f"Away {i}", 95 + i % 25, "")
+        for i in range(count)
+    ]
+
+def make_team_docs(count):
+    return [
+        {
+            "_id": uuid.uuid4().hex[:24], "team_name": f"Team {i}", "conference": "EASTERN",
+            "position": i + 1, "wins": 40, "losses": 30, "games_behind": 2.5,
+            "conf_record": "20-10", "home_record": "25-10", "away_record": "15-20",
+            "last_10": "6-4", "streak": "W2", "content_hash": "x"
+        }
+        for i in range(count)
+    ]
+
+async def default_path(rows, model, to_dict):
+    field = create_response_field(name="benchmark", type_=List[model])
+    content = [model(**to_dict(row)) for row in rows]
+    encoded = await serialize_response(field=field, response_content=content, is_coroutine=True)
+    return JSONResponse(encoded).body
+
+def fast_path(rows, encoder):
+    return FastJSONResponse([encoder(row) for row in rows]).body
+
+def per_row_us(fn, rows, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat / len(rows) * 1e6
+
+def main():
+    loop = asyncio.new_event_loop()
+    cases = [
+        ("games", make_game_rows, GameResponse, encode_game_row, encode_game_row),
+        ("teams", make_team_docs, TeamResponse, lambda d: {**d, "id": str(d["_id"])}, encode_team_doc),
+    ]
+    print(f"{'payload':<8}{'rows':>8}{'default us/row':>18}{'fast us/row':>14}{'speedup':>10}")
+    for name, make_rows, model, to_dict, encoder in cases:
+        for count in (100, 10_000):
+            rows = make_rows(count)
+            repeat = max(1, 20_000 // count)
+            default = per_row_us(
+                lambda: loop.run_until_complete(default_path(rows, model, to_dict)), rows, repeat
+            )
+            fast = per_row_us(lambda: fast_path(rows, encoder), rows, repeat)
+            print(f"{name:<8}{count:>8}{default:>18.2f}{fast:>14.2f}{default / fast:>9.1f}x")
+    loop.close()
+
+if __name__ == "__main__":
+    main()
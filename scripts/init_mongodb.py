@@ -8,12 +8,16 @@ def init_mongodb():
     # Create collections
     db.create_collection('users')
     db.create_collection('teams')
+    db.create_collection('notifications')
     
     # Create indexes
     db.users.create_index('email', unique=True)
     db.users.create_index('username')
+    db.users.create_index('favorite_teams')
     db.teams.create_index('team_name')
     db.teams.create_index([('conference', 1), ('position', 1)])
+    db.notifications.create_index([('user_id', 1), ('read', 1), ('date', -1), ('_id', -1)])
+    db.notifications.create_index('expires_at', expireAfterSeconds=0)
     
     print("MongoDB initialized successfully")
 
@@ -0,0 +1,49 @@
+"""
+Move notifications embedded in user documents into the notifications collection.
+
+Run from the repository root:
+    python -m scripts.migrate_notifications
+
+Each user's array is copied and then removed from the user document, so
+re-running only picks up users that have not been migrated yet.
+"""
+import asyncio
+from datetime import timedelta
+from app.config import get_settings
+from app.database.mongodb import mongodb
+
+settings = get_settings()
+
+async def migrate_notifications():
+    db = await mongodb.get_db()
+    migrated_users = 0
+    migrated = 0
+    cursor = db.users.find({"notifications": {"$exists": True}}, {"notifications": 1})
+    async for user in cursor:
+        notifications = [
+            {
+                "user_id": user["_id"],
+                "message": n["message"],
+                "date": n["date"],
+                "read": n.get("read", False),
+                "expires_at": n["date"] + timedelta(days=settings.NOTIFICATION_TTL_DAYS)
+            }
+            for n in user.get("notifications", [])
+        ]
+        if notifications:
+            await db.notifications.insert_many(notifications, ordered=False)
+        await db.users.update_one({"_id": user["_id"]}, {"$unset": {"notifications": ""}})
+        migrated_users += 1
+        migrated += len(notifications)
+
+    print(f"Migrated {migrated} notifications from {migrated_users} users")
+
+async def main():
+    await mongodb.connect()
+    try:
+        await migrate_notifications()
+    finally:
+        await mongodb.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,4 @@
+import os
+
+# Settings require a key at import time; tests never call SerpAPI
+os.environ.setdefault("SERPAPI_API_KEY", "test")
@@ -0,0 +1,55 @@
+import asyncio
+
+from app.database.cassandra import CassandraDB, STATEMENTS
+
+class StubResponseFuture:
+    has_more_pages = False
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def add_callbacks(self, callback, errback):
+        callback(self.rows)
+
+class StubSession:
+    def __init__(self):
+        self.prepared = []
+
+    def prepare(self, cql):
+        self.prepared.append(cql)
+        return ("prepared", cql)
+
+    def execute(self, statement, params=None):
+        assert statement[0] == "prepared"
+        return []
+
+    def execute_async(self, statement, params=None):
+        assert statement[0] == "prepared"
+        return StubResponseFuture([("row",)])
+
+def warmed_up_db():
+    db = CassandraDB()
+    db.session = StubSession()
+    db._prepare_statements()
+    return db
+
+def test_every_statement_is_prepared_once_at_connect():
+    db = warmed_up_db()
+
+    assert db.prepare_count == len(STATEMENTS)
+    assert sorted(db.session.prepared) == sorted(STATEMENTS.values())
+
+def test_no_reprepares_after_warm_up():
+    db = warmed_up_db()
+    warm = db.prepare_count
+
+    async def run_queries():
+        for _ in range(100):
+            for name in STATEMENTS:
+                db.execute(name, [])
+                assert await db.execute_async(name, []) == [("row",)]
+
+    asyncio.run(run_queries())
+
+    assert db.prepare_count == warm
+    assert len(db.session.prepared) == warm
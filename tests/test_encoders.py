@@ -0,0 +1,84 @@
+import uuid
+from datetime import date
+
+import pytest
+from cassandra.cqltypes import Int32Type, SimpleDateType, UTF8Type, UUIDType
+from cassandra.query import named_tuple_factory
+from fastapi.testclient import TestClient
+
+from app.database.cassandra import cassandra_db
+from app.main import app
+from app.responses import settings as response_settings
+from app.schemas.encoders import encode_game_row
+
+PROTOCOL_VERSION = 4
+
+GAME_COLUMNS = [
+    ("date", SimpleDateType), ("game_id", UUIDType), ("stage", UTF8Type),
+    ("team1_id", UUIDType), ("team1_name", UTF8Type), ("team1_score", Int32Type),
+    ("team2_id", UUIDType), ("team2_name", UTF8Type), ("team2_score", Int32Type),
+    ("highlight_video_link", UTF8Type),
+]
+
+def driver_game_row(game_date=date(2024, 1, 15), **values):
+    """A gamedetails row decoded by the driver's own column types and row factory"""
+    values = {
+        "date": game_date, "game_id": uuid.uuid4(), "stage": "Final",
+        "team1_id": uuid.uuid4(), "team1_name": "Boston Celtics", "team1_score": 110,
+        "team2_id": uuid.uuid4(), "team2_name": "Miami Heat", "team2_score": 104,
+        "highlight_video_link": "", **values
+    }
+    decoded = tuple(
+        cql_type.deserialize(cql_type.serialize(values[name], PROTOCOL_VERSION), PROTOCOL_VERSION)
+        for name, cql_type in GAME_COLUMNS
+    )
+    return named_tuple_factory([name for name, _ in GAME_COLUMNS], [decoded])[0]
+
+@pytest.fixture(params=[False, True], ids=["validated", "fast"])
+def client(request, monkeypatch):
+    monkeypatch.setattr(response_settings, "FAST_JSON_RESPONSES", request.param)
+    return TestClient(app)
+
+def stub_rows(monkeypatch, rows):
+    async def execute_async(name, params=None, all_pages=True):
+        return rows
+    monkeypatch.setattr(cassandra_db, "execute_async", execute_async)
+
+def test_encode_game_row_converts_driver_date():
+    row = driver_game_row()
+    assert type(row.date).__module__ == "cassandra.util"
+
+    game = encode_game_row(row)
+
+    assert type(game["date"]) is date
+    assert game["date"] == date(2024, 1, 15)
+    assert game["highlight_video_link"] is None
+
+def test_games_for_date_serializes_driver_rows(client, monkeypatch):
+    row = driver_game_row()
+    stub_rows(monkeypatch, [row])
+
+    response = client.get("/games/", params={"date": "2024-01-15"})
+
+    assert response.status_code == 200
+    assert response.json()[0]["date"] == "2024-01-15"
+    assert response.json()[0]["game_id"] == str(row.game_id)
+
+def test_games_for_date_surfaces_errors(monkeypatch):
+    async def execute_async(name, params=None, all_pages=True):
+        raise RuntimeError("read timeout")
+    monkeypatch.setattr(cassandra_db, "execute_async", execute_async)
+
+    response = TestClient(app, raise_server_exceptions=False).get("/games/recent")
+
+    assert response.status_code == 500
+
+def test_game_by_id_serializes_driver_row(client, monkeypatch):
+    row = driver_game_row(date(2024, 2, 29))
+    stub_rows(monkeypatch, [row])
+
+    response = client.get(f"/games/{row.game_id}")
+
+    assert response.status_code == 200
+    assert response.json()["date"] == "2024-02-29"
+    assert response.headers["ETag"]
@@ -0,0 +1,41 @@
+from datetime import date, datetime, timezone
+
+from app.config import get_settings
+from app.services.ingestion_scheduler import IngestionScheduler
+from app.services.serpapi_service import game_day, parse_game_date, parse_start_time
+
+def test_game_day_keeps_late_games_on_their_start_date():
+    # 11:30 PM and 1:30 AM Eastern on the same night
+    before_midnight = datetime(2024, 1, 16, 4, 30, tzinfo=timezone.utc)
+    after_midnight = datetime(2024, 1, 16, 6, 30, tzinfo=timezone.utc)
+
+    assert game_day(before_midnight) == date(2024, 1, 15)
+    assert game_day(after_midnight) == date(2024, 1, 15)
+    assert game_day(datetime(2024, 1, 16, 15, 0, tzinfo=timezone.utc)) == date(2024, 1, 16)
+
+def test_parse_game_date_relative_and_calendar_forms():
+    today = date(2024, 1, 2)
+
+    assert parse_game_date("Today, 7:30 PM", today) == today
+    assert parse_game_date("Yesterday", today) == date(2024, 1, 1)
+    assert parse_game_date("Tomorrow, 8:00 PM", today) == date(2024, 1, 3)
+    assert parse_game_date("Sat, Dec 30", today) == date(2023, 12, 30)
+    assert parse_game_date("Jan 13", today) == date(2024, 1, 13)
+    assert parse_game_date("", today) is None
+    assert parse_game_date(None, today) is None
+
+def test_parse_start_time_reads_game_timezone():
+    assert parse_start_time(date(2024, 1, 15), None, "Today, 7:30 PM") == datetime(2024, 1, 16, 0, 30)
+    assert parse_start_time(date(2024, 7, 1), "10:00 am") == datetime(2024, 7, 1, 14, 0)
+    assert parse_start_time(date(2024, 1, 15), "Final") is None
+
+def test_overnight_window_uses_game_timezone():
+    scheduler = IngestionScheduler()
+    settings = get_settings()
+
+    # 11 PM Eastern is 4 AM UTC: a late tip-off, not overnight
+    assert scheduler.scoreboard_interval(datetime(2024, 1, 16, 4, 0, tzinfo=timezone.utc)) \
+        == settings.SCOREBOARD_IDLE_INTERVAL
+    # 4 AM Eastern is 9 AM UTC
+    assert scheduler.scoreboard_interval(datetime(2024, 1, 16, 9, 0, tzinfo=timezone.utc)) \
+        == settings.SCOREBOARD_OVERNIGHT_INTERVAL
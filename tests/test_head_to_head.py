@@ -0,0 +1,125 @@
+import uuid
+from collections import namedtuple
+from datetime import date
+
+import pytest
+from cassandra.cqltypes import BooleanType, Int32Type, SimpleDateType, UTF8Type, UUIDType
+from cassandra.query import named_tuple_factory
+from fastapi.testclient import TestClient
+
+from app.database.cassandra import cassandra_db
+from app.main import app
+from app.services.serpapi_service import SerpAPIService
+
+LWTRow = namedtuple("LWTRow", ["applied", "totals_applied"])
+
+class LWTResult:
+    def __init__(self, applied, totals_applied=None):
+        self.was_applied = applied
+        self._row = LWTRow(applied, totals_applied)
+
+    def one(self):
+        return self._row
+
+class StubCassandra:
+    """head_to_head rows keyed by game_id, with counter updates that can be made to fail"""
+    def __init__(self):
+        self.rows = {}
+        self.counter_updates = 0
+        self.fail_counters = False
+
+    def execute_many(self, named_params, concurrency=None):
+        results = []
+        for name, params in named_params:
+            if name == "insert_head_to_head":
+                game_id = params[3]
+                if game_id in self.rows:
+                    results.append((True, LWTResult(False, self.rows[game_id])))
+                else:
+                    self.rows[game_id] = False
+                    results.append((True, LWTResult(True)))
+            elif name == "update_head_to_head_totals":
+                if self.fail_counters:
+                    results.append((False, RuntimeError("counter write timeout")))
+                else:
+                    self.counter_updates += 1
+                    results.append((True, None))
+            elif name == "mark_head_to_head_totals_applied":
+                self.rows[params[3]] = True
+                results.append((True, None))
+            else:
+                results.append((True, None))
+        return results
+
+@pytest.fixture
+def stub(monkeypatch):
+    stub = StubCassandra()
+    monkeypatch.setattr(cassandra_db, "execute_many", stub.execute_many)
+    return stub
+
+def final_game():
+    return {
+        "game_id": uuid.uuid4(), "date": date(2024, 1, 15), "stage": "Final",
+        "team1_id": uuid.uuid4(), "team1_score": 110,
+        "team2_id": uuid.uuid4(), "team2_score": 104, "highlight_video_link": ""
+    }
+
+def record(service, game):
+    errors = {}
+    service._record_head_to_head([game], None, errors)
+    return errors
+
+def test_reingesting_a_counted_game_does_not_count_it_again(stub):
+    game = final_game()
+    assert record(SerpAPIService(), game) == {}
+    # A restarted process has no in-memory record of the game
+    assert record(SerpAPIService(), game) == {}
+
+    assert stub.counter_updates == 1
+    assert stub.rows[game["game_id"]] is True
+
+def test_failed_counter_update_is_retried_on_next_ingest(stub):
+    service = SerpAPIService()
+    game = final_game()
+
+    stub.fail_counters = True
+    assert game["game_id"] in record(service, game)
+    assert stub.rows[game["game_id"]] is False
+
+    stub.fail_counters = False
+    assert record(service, game) == {}
+    assert stub.counter_updates == 1
+    assert stub.rows[game["game_id"]] is True
+
+HEAD_TO_HEAD_COLUMNS = [
+    ("team_a_id", UUIDType), ("team_b_id", UUIDType), ("date", SimpleDateType),
+    ("game_id", UUIDType), ("team_a_score", Int32Type), ("team_b_score", Int32Type),
+    ("highlight_video_link", UTF8Type), ("totals_applied", BooleanType),
+]
+
+def driver_head_to_head_row(**values):
+    """A head_to_head row decoded by the driver's own column types and row factory"""
+    decoded = tuple(
+        cql_type.deserialize(cql_type.serialize(values[name], 4), 4)
+        for name, cql_type in HEAD_TO_HEAD_COLUMNS
+    )
+    return named_tuple_factory([name for name, _ in HEAD_TO_HEAD_COLUMNS], [decoded])[0]
+
+def test_head_to_head_serializes_driver_dates(monkeypatch):
+    team_a, team_b = sorted([uuid.uuid4(), uuid.uuid4()], key=str)
+    row = driver_head_to_head_row(
+        team_a_id=team_a, team_b_id=team_b, date=date(2024, 1, 15), game_id=uuid.uuid4(),
+        team_a_score=110, team_b_score=104, highlight_video_link="", totals_applied=True
+    )
+    assert type(row.date).__module__ == "cassandra.util"
+
+    async def execute_async(name, params=None, all_pages=True):
+        return [row] if name == "select_head_to_head_recent" else []
+    monkeypatch.setattr(cassandra_db, "execute_async", execute_async)
+
+    response = TestClient(app).get(f"/analytics/teams/head-to-head/{team_b}/{team_a}")
+
+    assert response.status_code == 200
+    game = response.json()["last_games"][0]
+    assert game["date"] == "2024-01-15"
+    assert (game["team1_score"], game["team2_score"]) == (104, 110)
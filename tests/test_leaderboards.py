@@ -0,0 +1,58 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.services import leaderboard_service
+from app.services.dgraph_service import STAT_FIELDS, dgraph_service
+from app.services.leaderboard_service import Leaderboards
+from app.services.player_stats_service import SeasonStats
+
+@pytest.fixture
+def boards():
+    boards = Leaderboards()
+    yield boards
+    dgraph_service.stats_listeners.remove(boards._on_stats)
+
+def test_min_games_keeps_one_game_players_off_the_board(boards):
+    boards.record("one-game", "One Game", "g0", {"points": 50})
+    for i in range(4):
+        boards.record("regular", "Regular", f"g{i}", {"points": 20})
+
+    assert [row["player_id"] for row in boards.leaders("points")] == ["regular"]
+    assert [row["player_id"] for row in boards.leaders("points", min_games=1)] == ["one-game", "regular"]
+
+def test_rerecorded_game_replaces_its_contribution(boards):
+    boards.record("p", "P", "g1", {"points": 10})
+    boards.record("p", "P", "g1", {"points": 30})
+
+    assert boards.leaders("points", min_games=1)[0]["per_game"] == 30.0
+    assert boards.leaders("points", min_games=1)[0]["games"] == 1
+
+def test_new_season_resets_and_rebuilds(boards, monkeypatch):
+    old_season = boards.season
+    boards.record("last-year", "Last Year", "g-old", {"points": 30})
+    rebuilt = []
+
+    async def load_season(season, refresh=False):
+        rebuilt.append(season)
+        return SeasonStats(season, ["new"], ["New"], np.zeros(1, dtype=np.int32), ["g-new"],
+                           {stat: np.full(1, 25.0) for stat in STAT_FIELDS})
+
+    monkeypatch.setattr(leaderboard_service, "current_season", lambda: old_season + 1)
+    monkeypatch.setattr(leaderboard_service.player_stats_service, "load_season", load_season)
+
+    async def new_box_score():
+        boards._on_stats(
+            {"player_id": "new", "name": "New"},
+            {"game_id": "g-new", "date": f"{old_season + 1}-10-25T00:00:00Z"},
+            {"points": 25}
+        )
+        assert boards.season == old_season + 1
+        assert [row["player_id"] for row in boards.leaders("points")] == ["new"]
+        await boards._rebuild_task
+
+    asyncio.run(new_box_score())
+
+    assert rebuilt == [old_season + 1]
+    assert [row["player_id"] for row in boards.leaders("points")] == ["new"]
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database.dgraph import dgraph_db
+from app.main import app
+from app.services.auth import get_current_user
+from app.services import leaderboard_service
+from app.services.dgraph_service import STAT_FIELDS, DgraphService
+from app.services.leaderboard_service import leaderboards
+from app.services.player_stats_service import current_season
+
+SEASON = 2023
+
+def box_score(**values):
+    return {"minutes": 36.0, **{stat: 0 for stat in STAT_FIELDS if stat != "minutes"}, **values}
+
+class StubDgraph:
+    """Captures upsert blocks and answers them as if the player and game exist"""
+    def __init__(self, found=True):
+        self.calls = []
+        self.found = found
+
+    async def run(self, fn, query, mutations, max_retries):
+        assert fn is DgraphService._upsert
+        self.calls.append((query, mutations))
+        if not self.found:
+            return 0, {"player": [], "game": []}
+        return 0, {
+            "player": [{"player_id": "p-1", "name": "Stub Player"}],
+            "game": [{"game_id": "g-1", "date": f"{SEASON + 1}-01-15T00:00:00Z"}]
+        }
+
+@pytest.fixture
+def dgraph(monkeypatch):
+    stub = StubDgraph()
+    monkeypatch.setattr(dgraph_db, "run", stub.run)
+    return stub
+
+@pytest.fixture
+def season(monkeypatch):
+    """Pin the leaderboards to SEASON so the stub game date always counts"""
+    monkeypatch.setattr(leaderboard_service, "current_season", lambda: SEASON)
+    leaderboards._reset(SEASON)
+    yield SEASON
+    leaderboards._reset(current_season())
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[get_current_user] = lambda: {"email": "scorer@example.com"}
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+def test_record_writes_typed_facets_in_one_upsert(dgraph):
+    recorded = asyncio.run(
+        DgraphService.record_player_game_stats("p-1", "g-1", box_score(minutes=34.5, points=30))
+    )
+
+    assert recorded
+    (query, mutations), = dgraph.calls
+    assert 'p as var(func: eq(player_id, "p-1"))' in query
+    assert 'g as var(func: eq(game_id, "g-1"))' in query
+    assert mutations == [{
+        "set_nquads": (
+            "uid(p) <participated_in> uid(g) (minutes=34.5, points=30, rebounds=0, assists=0, "
+            "steals=0, blocks=0, turnovers=0, fgm=0, fga=0, fg3m=0, fg3a=0, ftm=0, fta=0) .\n"
+            "uid(g) <players> uid(p) ."
+        ),
+        "cond": "@if(eq(len(p), 1) AND eq(len(g), 1))"
+    }]
+
+def test_record_rejects_unknown_stats(dgraph):
+    with pytest.raises(ValueError):
+        asyncio.run(DgraphService.record_player_game_stats("p-1", "g-1", box_score(dunks=3)))
+    assert dgraph.calls == []
+
+def test_record_rejects_partial_box_scores(dgraph):
+    with pytest.raises(ValueError):
+        asyncio.run(DgraphService.record_player_game_stats("p-1", "g-1", {"points": 41}))
+    assert dgraph.calls == []
+
+def test_endpoint_records_stats_and_updates_leaderboard(client, dgraph, season):
+    response = client.put("/players/p-1/games/g-1/stats", json=box_score(points=41, minutes=38))
+
+    assert response.status_code == 200
+    assert len(dgraph.calls) == 1
+    leader = next(row for row in leaderboards.leaders("points", 100, min_games=1) if row["player_id"] == "p-1")
+    assert leader["name"] == "Stub Player"
+    assert leader["per_game"] == 41.0
+
+def test_endpoint_returns_404_for_unknown_player_or_game(client, monkeypatch):
+    monkeypatch.setattr(dgraph_db, "run", StubDgraph(found=False).run)
+
+    response = client.put("/players/nobody/games/g-1/stats", json=box_score(points=10))
+
+    assert response.status_code == 404
+
+def test_endpoint_validates_stats(client, dgraph):
+    assert client.put("/players/p-1/games/g-1/stats", json=box_score(points=-1)).status_code == 422
+    assert client.put("/players/p-1/games/g-1/stats", json={"points": 41}).status_code == 422
+    assert client.put("/players/p-1/games/g-1/stats", json={}).status_code == 422
+    assert dgraph.calls == []
@@ -0,0 +1,108 @@
+import re
+from datetime import date
+from itertools import product
+
+import pytest
+
+from app.services.player_queries import (
+    PLAYER_GAMES_QUERIES, PLAYERS_QUERIES, SEARCH_PLAYERS_QUERY,
+    player_games_query, players_query
+)
+from app.services.player_search import regex_literal
+
+def declared_variables(query: str) -> set:
+    header = re.search(r"query \w+\(([^)]*)\)", query).group(1)
+    return {param.split(":")[0].strip() for param in header.split(",")}
+
+def used_variables(query: str) -> set:
+    body = query[query.index("{"):]
+    return set(re.findall(r"\$\w+", body))
+
+def root_line(query: str) -> str:
+    return next(line.strip() for line in query.splitlines() if "(func:" in line)
+
+def assert_bindings_match(query: str, variables: dict):
+    # Dgraph rejects declared-but-unused variables; pydgraph needs string values
+    assert declared_variables(query) == used_variables(query) == set(variables)
+    assert all(isinstance(value, str) for value in variables.values())
+
+def test_every_players_combination_is_precompiled():
+    assert set(PLAYERS_QUERIES) == set(product((False, True), repeat=3))
+    assert set(PLAYER_GAMES_QUERIES) == set(product((False, True), repeat=2))
+
+@pytest.mark.parametrize("position,team_id,after", [
+    (position, team_id, after)
+    for position in (None, "PG")
+    for team_id in (None, "0x2a")
+    for after in (None, "0x10")
+])
+def test_players_query_text_and_bindings(position, team_id, after):
+    query, variables = players_query(position, team_id, skip=20, limit=10, after=after)
+
+    assert query is PLAYERS_QUERIES[(bool(position), bool(team_id), bool(after))]
+    assert_bindings_match(query, variables)
+    assert variables["$limit"] == "10"
+
+    root = root_line(query)
+    assert root.startswith("players(func: type(Player), first: $limit, ")
+    if after:
+        assert "after: $after" in root and "offset" not in root
+        assert variables["$after"] == after
+    else:
+        assert "offset: $offset" in root and "after" not in root
+        assert variables["$offset"] == "20"
+
+    filters = re.search(r"@filter\((.*)\) \{", root).group(1)
+    expected = [f for f, on in (
+        ("eq(position, $position)", position),
+        ("uid_in(plays_for, $team_id)", team_id),
+    ) if on]
+    assert filters == (" AND ".join(expected) if expected else "has(player_id)")
+    if position:
+        assert variables["$position"] == "PG"
+    if team_id:
+        assert variables["$team_id"] == "0x2a"
+
+@pytest.mark.parametrize("start_date,end_date", [
+    (None, None),
+    (date(2024, 1, 1), None),
+    (None, date(2024, 3, 31)),
+    (date(2024, 1, 1), date(2024, 3, 31)),
+])
+def test_player_games_query_text_and_bindings(start_date, end_date):
+    query, variables = player_games_query("p-23", start_date, end_date)
+
+    assert query is PLAYER_GAMES_QUERIES[(start_date is not None, end_date is not None)]
+    assert_bindings_match(query, variables)
+    assert variables["$player_id"] == "p-23"
+    assert "participated_in (orderasc: date) @facets" in query
+
+    edge = next(line.strip() for line in query.splitlines() if "participated_in" in line)
+    expected = []
+    if start_date:
+        expected.append("ge(date, $start_date)")
+        assert variables["$start_date"] == "2024-01-01"
+    if end_date:
+        expected.append("le(date, $end_date)")
+        assert variables["$end_date"] == "2024-03-31"
+    if expected:
+        assert f"@filter({' AND '.join(expected)})" in edge
+    else:
+        assert "@filter" not in edge
+
+def test_search_query_binds_escaped_regex():
+    variables = {"$name": regex_literal("O'Neal / Jr. (III)"), "$limit": "5"}
+
+    assert_bindings_match(SEARCH_PLAYERS_QUERY, variables)
+    assert root_line(SEARCH_PLAYERS_QUERY).startswith("players(func: regexp(name, $name), first: $limit)")
+    assert variables["$name"] == "/O'Neal\\ \\/\\ Jr\\.\\ \\(III\\)/i"
+
+@pytest.mark.parametrize("text", ["a.b", "x*", "(y)", "a/b", "[z]", "c+d?", "^e$"])
+def test_regex_literal_matches_only_the_literal_text(text):
+    literal = regex_literal(text)
+    assert literal.startswith("/") and literal.endswith("/i")
+
+    pattern = literal[1:-2].replace("\\/", "/")
+    assert re.fullmatch(pattern, text, re.IGNORECASE)
+    # Metacharacters are literal: the pattern doesn't match a variant of the text
+    assert not re.fullmatch(pattern, text + text[-1] if text[-1] in "*+?" else "Q" + text)
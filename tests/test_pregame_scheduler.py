@@ -0,0 +1,144 @@
+import asyncio
+import uuid
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from app.database.cassandra import cassandra_db
+from app.database.mongodb import mongodb
+from app.services.pregame_scheduler import PregameScheduler, TimingWheel, settings
+
+GameRow = namedtuple("GameRow", ["date", "game_id", "stage", "team1_id", "team1_name",
+                                 "team2_id", "team2_name", "start_time"])
+
+NOW = datetime(2024, 1, 15, 23, 0)
+EPOCH = datetime(1970, 1, 1)
+
+class Claims:
+    def __init__(self, claimed=()):
+        self.ids = set(claimed)
+
+    def find(self, query, projection=None):
+        ids = [i for i in query["_id"]["$in"] if i in self.ids]
+
+        async def cursor():
+            for game_id in ids:
+                yield {"_id": game_id}
+        return cursor()
+
+    async def insert_one(self, doc):
+        if doc["_id"] in self.ids:
+            raise DuplicateKeyError("duplicate")
+        self.ids.add(doc["_id"])
+
+    async def delete_one(self, query):
+        self.ids.discard(query["_id"])
+
+class StubDB:
+    def __init__(self, claims):
+        self.pregame_notifications = claims
+
+def game_row(trigger_offset_seconds, stage="7:30 PM"):
+    """A scheduled game whose pre-game trigger is offset from NOW"""
+    start = NOW + timedelta(minutes=settings.PREGAME_LEAD_MINUTES, seconds=trigger_offset_seconds)
+    return GameRow(date(2024, 1, 15), uuid.uuid4(), stage, uuid.uuid4(), "Home",
+                   uuid.uuid4(), "Away", start)
+
+@pytest.fixture
+def scheduler_for(monkeypatch):
+    def build(rows, claimed=()):
+        async def execute_async(name, params=None, all_pages=True):
+            assert name == "select_games_by_date"
+            return [row for row in rows if row.date == params[0]]
+
+        claims = Claims(str(game_id) for game_id in claimed)
+
+        async def get_db():
+            return StubDB(claims)
+
+        monkeypatch.setattr(cassandra_db, "execute_async", execute_async)
+        monkeypatch.setattr(mongodb, "get_db", get_db)
+
+        sent = []
+
+        async def handler(game):
+            sent.append(game["game_id"])
+
+        clock = lambda: (NOW - EPOCH).total_seconds()
+        return PregameScheduler(handler=handler, clock=clock), sent
+    return build
+
+def reload_twice(scheduler):
+    async def run():
+        for _ in range(2):
+            await scheduler.load_upcoming(date(2024, 1, 15))
+            await asyncio.gather(*list(scheduler._pending))
+    asyncio.run(run())
+
+def test_reload_keeps_one_trigger_per_upcoming_game(scheduler_for):
+    upcoming = game_row(600)
+    scheduler, sent = scheduler_for([upcoming, game_row(1200, stage="Final")])
+
+    reload_twice(scheduler)
+
+    assert len(scheduler.wheel) == 1 and str(upcoming.game_id) in scheduler.wheel
+    assert sent == []
+
+def test_missed_trigger_fires_once_across_reloads(scheduler_for):
+    missed = game_row(-60)
+    scheduler, sent = scheduler_for([missed])
+
+    reload_twice(scheduler)
+
+    assert sent == [missed.game_id]
+    assert scheduler.stats_counters["fired"] == 1
+    assert scheduler.stats_counters["duplicates"] == 0
+
+def test_past_and_claimed_games_are_not_rescheduled(scheduler_for):
+    claimed = game_row(-60)
+    too_late = game_row(-(settings.PREGAME_MAX_LATENESS_SECONDS + 60))
+    scheduler, sent = scheduler_for([claimed, too_late], claimed=[claimed.game_id])
+
+    reload_twice(scheduler)
+
+    assert sent == []
+    assert len(scheduler.wheel) == 0
+    assert scheduler.stats_counters["dropped_late"] == 0
+    assert scheduler.stats_counters["duplicates"] == 0
+
+def test_failed_send_releases_its_claim_for_the_next_reload(scheduler_for):
+    missed = game_row(-60)
+    scheduler, sent = scheduler_for([missed])
+    deliver = scheduler.handler
+    attempts = []
+
+    async def flaky_handler(game):
+        attempts.append(game["game_id"])
+        if len(attempts) == 1:
+            raise RuntimeError("fan-out failed")
+        await deliver(game)
+    scheduler.handler = flaky_handler
+
+    reload_twice(scheduler)
+
+    assert attempts == [missed.game_id, missed.game_id]
+    assert sent == [missed.game_id]
+    assert scheduler.stats_counters["failed"] == 1
+    assert scheduler.stats_counters["fired"] == 1
+
+def test_timing_wheel_fires_each_entry_at_its_tick():
+    wheel = TimingWheel(slots=8, levels=3, start_tick=100)
+    due = {f"g{i}": 100 + i * 7 for i in range(1, 70)}
+    for key, tick in due.items():
+        assert wheel.add(key, tick, key) == []
+    wheel.cancel("g3")
+
+    fired = {}
+    for tick in range(101, 100 + 8 ** 3):
+        for due_tick, key in wheel.advance(tick):
+            fired[key] = tick
+
+    assert fired == {key: tick for key, tick in due.items() if key != "g3"}
+    assert len(wheel) == 0
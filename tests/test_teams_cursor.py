@@ -0,0 +1,61 @@
+import pytest
+from bson import ObjectId
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.pagination import encode_cursor
+from app.schemas.encoders import encode_team_doc
+from app.services.dgraph_service import dgraph_service
+from app.services.standings_service import StandingsSnapshot, standings_service
+
+@pytest.fixture
+def client(monkeypatch):
+    teams = [
+        encode_team_doc({"_id": ObjectId(), "team_name": f"Team {i}", "conference": conf, "position": i})
+        for conf in ("EASTERN", "WESTERN") for i in range(1, 4)
+    ]
+    monkeypatch.setattr(standings_service, "snapshot", StandingsSnapshot(teams, version=1))
+    return TestClient(app)
+
+@pytest.mark.parametrize("position", [
+    ["EASTERN", "x", str(ObjectId())],
+    [1, 2, str(ObjectId())],
+    ["EASTERN", True, str(ObjectId())],
+    ["EASTERN", 2, "not-an-id"],
+    ["EASTERN", 2, 3],
+])
+def test_malformed_cursor_is_rejected(client, position):
+    response = client.get("/teams/", params={"cursor": encode_cursor(position)})
+
+    assert response.status_code == 400
+
+def test_cursor_pages_through_snapshot(client):
+    first = client.get("/teams/", params={"limit": 4})
+    second = client.get("/teams/", params={"limit": 4, "cursor": first.headers["X-Next-Cursor"]})
+
+    assert second.status_code == 200
+    assert [t["position"] for t in first.json() + second.json()] == [1, 2, 3, 1, 2, 3]
+
+@pytest.fixture
+def player_queries(monkeypatch):
+    queries = []
+    async def execute_query(query, variables=None):
+        # pydgraph only accepts string variables
+        assert all(isinstance(value, str) for value in (variables or {}).values())
+        queries.append((query, variables))
+        return {"players": []}
+    monkeypatch.setattr(dgraph_service, "execute_query", execute_query)
+    return queries
+
+@pytest.mark.parametrize("position", [[5], [["x"]], [0], [None], ["not-a-uid"], ["0x1f; drop"]])
+def test_malformed_player_cursor_is_rejected(player_queries, position):
+    response = TestClient(app).get("/players/", params={"cursor": encode_cursor(position)})
+
+    assert response.status_code == 400
+    assert player_queries == []
+
+def test_player_cursor_is_passed_as_uid(player_queries):
+    response = TestClient(app).get("/players/", params={"cursor": encode_cursor(["0x1f"])})
+
+    assert response.status_code == 200
+    assert player_queries[0][1]["$after"] == "0x1f"